@@ -12,7 +12,92 @@ from typing import Optional
 
 from .appimage_manager import AppImageManager, AppImageInfo
 from .desktop_integration import DesktopIntegration
-from .gui_dialogs import dialogs, DialogResult
+from .gui_dialogs import get_dialogs, DialogResult
+
+
+# Version update dialogs keyed by the sign of compare_versions(new, installed)
+_UPDATE_MESSAGES = {
+    1: (
+        "Update Available",
+        "A newer version of '{app_name}' is available!\n\n"
+        "Installed version: {existing_version}\n"
+        "New version: {new_version}\n\n"
+        "Would you like to update to the new version?\n\n"
+        "This will:\n"
+        "• Replace the current version\n"
+        "• Keep your launcher shortcuts\n"
+        "• Launch the updated application\n\n"
+        "Click 'Yes' to update or 'No' to cancel."
+    ),
+    0: (
+        "Same Version Detected",
+        "'{app_name}' version {existing_version} is already installed.\n\n"
+        "Would you like to reinstall it?\n\n"
+        "This will:\n"
+        "• Replace the current installation\n"
+        "• Keep your launcher shortcuts\n"
+        "• Launch the application\n\n"
+        "Click 'Yes' to reinstall or 'No' to cancel."
+    ),
+    -1: (
+        "Older Version Detected",
+        "You are trying to install an older version of '{app_name}'.\n\n"
+        "Installed version: {existing_version}\n"
+        "This version: {new_version}\n\n"
+        "Would you like to downgrade to this version?\n\n"
+        "This will:\n"
+        "• Replace the newer version\n"
+        "• Keep your launcher shortcuts\n"
+        "• Launch the application\n\n"
+        "Click 'Yes' to downgrade or 'No' to cancel."
+    ),
+}
+
+# Dialog message templates, formatted with str.format() at the call site
+_MESSAGES = {
+    'invalid_file': "The file '{name}' is not a valid AppImage file.",
+    'handle_error': "An error occurred while handling the AppImage:\n{error}",
+    'already_installed': (
+        "The AppImage '{app_name}' is already installed on your system.\n\n"
+        "What would you like to do?\n\n"
+        "• Click 'Yes' to uninstall it\n"
+        "• Click 'No' to launch it"
+    ),
+    'registered_error': "Error handling registered AppImage: {error}",
+    'extraction_failed': "Could not extract information from the AppImage file.",
+    'unregistered_error': "Error handling unregistered AppImage: {error}",
+    'version_update_error': "Error handling version update: {error}",
+    'install_question': (
+        "Would you like to install '{app_name}' to your system?\n\n"
+        "This will:\n"
+        "• Create a launcher shortcut\n"
+        "• Add it to your applications menu\n"
+        "• Launch the application\n\n"
+        "Click 'Yes' to install and launch, or 'No' to cancel."
+    ),
+    'update_install_failed': "Could not install the new version to system.",
+    'update_shortcut_failed': "Could not update launcher shortcut.",
+    'update_success': (
+        "'{app_name}' has been successfully {action}!\n\n"
+        "New version: {version}\n"
+        "You can find it in your applications menu."
+    ),
+    'update_error': "Error during update: {error}",
+    'install_failed': "Could not install AppImage to system.",
+    'install_shortcut_failed': "Could not create launcher shortcut.",
+    'install_success': (
+        "'{app_name}' has been successfully installed!\n\n"
+        "You can now find it in your applications menu."
+    ),
+    'install_error': "Error during installation: {error}",
+    'uninstall_success': "'{app_name}' has been successfully uninstalled from your system.",
+    'uninstall_error': "Error during uninstallation: {error}",
+    'launch_failed': (
+        "Could not launch '{app_name}'.\n\n"
+        "Please check that the AppImage file is valid and executable."
+    ),
+    'launch_error': "Error launching '{app_name}': {error}",
+}
 
 
 class AppImageHandler:
@@ -31,6 +116,42 @@ class AppImageHandler:
         self.manager = AppImageManager()
         self.desktop = DesktopIntegration()
     
+    def _show_error(self, title: str, key: str, **kwargs) -> None:
+        """
+        Show an error dialog using a message template.
+        
+        Args:
+            title (str): Dialog title.
+            key (str): Key of the message template in _MESSAGES.
+            **kwargs: Values substituted into the template.
+        """
+        get_dialogs().show_error(title, _MESSAGES[key].format(**kwargs))
+    
+    def _show_info(self, title: str, key: str, **kwargs) -> None:
+        """
+        Show an information dialog using a message template.
+        
+        Args:
+            title (str): Dialog title.
+            key (str): Key of the message template in _MESSAGES.
+            **kwargs: Values substituted into the template.
+        """
+        get_dialogs().show_info(title, _MESSAGES[key].format(**kwargs))
+    
+    def _show_question(self, title: str, key: str, **kwargs) -> DialogResult:
+        """
+        Show a yes/no question dialog using a message template.
+        
+        Args:
+            title (str): Dialog title.
+            key (str): Key of the message template in _MESSAGES.
+            **kwargs: Values substituted into the template.
+            
+        Returns:
+            DialogResult: The user's response.
+        """
+        return get_dialogs().show_question(title, _MESSAGES[key].format(**kwargs))
+    
     def handle_appimage(self, appimage_path: str) -> bool:
         """
         Handle an AppImage file according to the main workflow.
@@ -42,12 +163,12 @@ class AppImageHandler:
             bool: True if handling was successful, False otherwise.
         """
         try:
+            # Resolve the absolute path once and pass it to all downstream calls
+            appimage_path = self.manager._get_registry_key(appimage_path)
+            
             # Validate AppImage
             if not self.manager.is_appimage(appimage_path):
-                dialogs.show_error(
-                    "Invalid File",
-                    f"The file '{Path(appimage_path).name}' is not a valid AppImage file."
-                )
+                self._show_error("Invalid File", 'invalid_file', name=Path(appimage_path).name)
                 return False
             
             # Check if already registered
@@ -57,10 +178,7 @@ class AppImageHandler:
                 return self._handle_unregistered_appimage(appimage_path)
                 
         except Exception as e:
-            dialogs.show_error(
-                "Error",
-                f"An error occurred while handling the AppImage:\n{str(e)}"
-            )
+            self._show_error("Error", 'handle_error', error=e)
             return False
     
     def _handle_registered_appimage(self, appimage_path: str) -> bool:
@@ -83,13 +201,7 @@ class AppImageHandler:
             app_name = info.name
             
             # Ask user what to do
-            response = dialogs.show_question(
-                f"AppImage Already Installed",
-                f"The AppImage '{app_name}' is already installed on your system.\n\n"
-                f"What would you like to do?\n\n"
-                f"• Click 'Yes' to uninstall it\n"
-                f"• Click 'No' to launch it"
-            )
+            response = self._show_question("AppImage Already Installed", 'already_installed', app_name=app_name)
             
             if response == DialogResult.YES:
                 # Uninstall the AppImage
@@ -99,10 +211,7 @@ class AppImageHandler:
                 return self._launch_appimage(info.exec_command, app_name)
                 
         except Exception as e:
-            dialogs.show_error(
-                "Error",
-                f"Error handling registered AppImage: {str(e)}"
-            )
+            self._show_error("Error", 'registered_error', error=e)
             return False
     
     def _handle_unregistered_appimage(self, appimage_path: str) -> bool:
@@ -119,10 +228,7 @@ class AppImageHandler:
             # Extract AppImage information
             info = self.manager.extract_appimage_info(appimage_path)
             if not info:
-                dialogs.show_error(
-                    "Extraction Failed",
-                    "Could not extract information from the AppImage file."
-                )
+                self._show_error("Extraction Failed", 'extraction_failed')
                 return False
             
             app_name = info.name
@@ -138,10 +244,7 @@ class AppImageHandler:
                 return self._handle_fresh_install(info)
                 
         except Exception as e:
-            dialogs.show_error(
-                "Error",
-                f"Error handling unregistered AppImage: {str(e)}"
-            )
+            self._show_error("Error", 'unregistered_error', error=e)
             return False
     
     def _handle_version_update(self, new_info: AppImageInfo, existing_info: AppImageInfo) -> bool:
@@ -160,62 +263,28 @@ class AppImageHandler:
             new_version = new_info.version
             existing_version = existing_info.version
             
-            # Compare versions
-            is_newer = self.manager.is_newer_version(new_version, existing_version)
-            
-            if is_newer:
-                # New version is newer
-                response = dialogs.show_question(
-                    "Update Available",
-                    f"A newer version of '{app_name}' is available!\n\n"
-                    f"Installed version: {existing_version}\n"
-                    f"New version: {new_version}\n\n"
-                    f"Would you like to update to the new version?\n\n"
-                    f"This will:\n"
-                    f"• Replace the current version\n"
-                    f"• Keep your launcher shortcuts\n"
-                    f"• Launch the updated application\n\n"
-                    f"Click 'Yes' to update or 'No' to cancel."
-                )
-            elif self.manager.compare_versions(new_version, existing_version) == 0:
-                # Same version
-                response = dialogs.show_question(
-                    "Same Version Detected",
-                    f"'{app_name}' version {existing_version} is already installed.\n\n"
-                    f"Would you like to reinstall it?\n\n"
-                    f"This will:\n"
-                    f"• Replace the current installation\n"
-                    f"• Keep your launcher shortcuts\n"
-                    f"• Launch the application\n\n"
-                    f"Click 'Yes' to reinstall or 'No' to cancel."
-                )
-            else:
-                # New version is older
-                response = dialogs.show_question(
-                    "Older Version Detected",
-                    f"You are trying to install an older version of '{app_name}'.\n\n"
-                    f"Installed version: {existing_version}\n"
-                    f"This version: {new_version}\n\n"
-                    f"Would you like to downgrade to this version?\n\n"
-                    f"This will:\n"
-                    f"• Replace the newer version\n"
-                    f"• Keep your launcher shortcuts\n"
-                    f"• Launch the application\n\n"
-                    f"Click 'Yes' to downgrade or 'No' to cancel."
+            # Compare versions once and pick the matching dialog
+            version_cmp = self.manager.compare_versions(new_version, existing_version)
+            title, message = _UPDATE_MESSAGES[(version_cmp > 0) - (version_cmp < 0)]
+            
+            response = get_dialogs().show_question(
+                title,
+                message.format(
+                    app_name=app_name,
+                    new_version=new_version,
+                    existing_version=existing_version
                 )
+            )
             
             if response == DialogResult.YES:
                 # User wants to update/reinstall/downgrade
-                return self._perform_update(new_info, existing_info)
+                return self._perform_update(new_info, existing_info, version_cmp)
             else:
                 # User cancelled
                 return True
                 
         except Exception as e:
-            dialogs.show_error(
-                "Update Error",
-                f"Error handling version update: {str(e)}"
-            )
+            self._show_error("Update Error", 'version_update_error', error=e)
             return False
     
     def _handle_fresh_install(self, info: AppImageInfo) -> bool:
@@ -231,15 +300,7 @@ class AppImageHandler:
         app_name = info.name
         
         # Ask user if they want to install
-        response = dialogs.show_question(
-            "Install AppImage?",
-            f"Would you like to install '{app_name}' to your system?\n\n"
-            f"This will:\n"
-            f"• Create a launcher shortcut\n"
-            f"• Add it to your applications menu\n"
-            f"• Launch the application\n\n"
-            f"Click 'Yes' to install and launch, or 'No' to cancel."
-        )
+        response = self._show_question("Install AppImage?", 'install_question', app_name=app_name)
         
         if response == DialogResult.YES:
             # Install and launch the AppImage
@@ -248,13 +309,15 @@ class AppImageHandler:
             # User cancelled
             return True
     
-    def _perform_update(self, new_info: AppImageInfo, existing_info: AppImageInfo) -> bool:
+    def _perform_update(self, new_info: AppImageInfo, existing_info: AppImageInfo,
+                        version_cmp: int) -> bool:
         """
         Perform the actual update by removing the old version and installing the new one.
         
         Args:
             new_info (AppImageInfo): Information about the new AppImage.
             existing_info (AppImageInfo): Information about the existing version.
+            version_cmp (int): Result of comparing the new version to the existing one.
             
         Returns:
             bool: True if update was successful, False otherwise.
@@ -264,36 +327,24 @@ class AppImageHandler:
             preserved_desktop_path = existing_info.desktop_file_path
             preserved_icon_path = existing_info.icon_path
             
-            # Remove the old version (but keep desktop integration for seamless update)
-            old_exec_path = Path(existing_info.exec_command) if existing_info.exec_command else None
-            if old_exec_path and old_exec_path.exists() and old_exec_path.parent == self.manager.appimage_storage:
-                old_exec_path.unlink()
-            
-            # Unregister the old version from registry
-            self.manager.unregister_appimage(existing_info.appimage_path)
-            
             # Use preserved icon if the new version doesn't have a good one
             if preserved_icon_path and (not new_info.icon_path or new_info.icon_path == 'application-x-executable'):
                 new_info.icon_path = preserved_icon_path
             
-            # Install the new version
-            if not self.manager.install_appimage(new_info):
-                dialogs.show_error(
-                    "Update Failed",
-                    "Could not install the new version to system."
-                )
+            # Replace the old version's executable and registry entry with the
+            # new one (desktop integration is kept for a seamless update)
+            if not self.manager.replace_appimage(existing_info, new_info):
+                self._show_error("Update Failed", 'update_install_failed')
                 return False
             
-            # Update desktop file with new information
-            if preserved_desktop_path:
-                self.desktop.remove_desktop_file(preserved_desktop_path)
-            
-            desktop_path = self.desktop.create_desktop_file(new_info)
+            # Update desktop file with new information (one database refresh)
+            with self.desktop.batched():
+                if preserved_desktop_path:
+                    self.desktop.remove_desktop_file(preserved_desktop_path)
+                
+                desktop_path = self.desktop.create_desktop_file(new_info)
             if not desktop_path:
-                dialogs.show_error(
-                    "Update Failed",
-                    "Could not update launcher shortcut."
-                )
+                self._show_error("Update Failed", 'update_shortcut_failed')
                 return False
             
             # Update info with desktop file path
@@ -303,22 +354,17 @@ class AppImageHandler:
             self.desktop.create_desktop_shortcut(new_info)
             
             # Show success message
-            action = "updated" if self.manager.is_newer_version(new_info.version, existing_info.version) else "reinstalled"
-            dialogs.show_info(
-                "Update Successful",
-                f"'{new_info.name}' has been successfully {action}!\n\n"
-                f"New version: {new_info.version}\n"
-                f"You can find it in your applications menu."
+            action = "updated" if version_cmp > 0 else "reinstalled"
+            self._show_info(
+                "Update Successful", 'update_success',
+                app_name=new_info.name, action=action, version=new_info.version
             )
             
             # Launch the updated application
             return self._launch_appimage(new_info.exec_command, new_info.name)
             
         except Exception as e:
-            dialogs.show_error(
-                "Update Error",
-                f"Error during update: {str(e)}"
-            )
+            self._show_error("Update Error", 'update_error', error=e)
             return False
     
     def _install_appimage(self, info: AppImageInfo) -> bool:
@@ -335,10 +381,7 @@ class AppImageHandler:
             # Install AppImage (copy to storage and register)
             # This updates info.exec_command to point to the executable copy
             if not self.manager.install_appimage(info):
-                dialogs.show_error(
-                    "Installation Failed",
-                    "Could not install AppImage to system."
-                )
+                self._show_error("Installation Failed", 'install_failed')
                 return False
             
             # Create desktop file (after installation so exec_command points to copy)
@@ -346,10 +389,7 @@ class AppImageHandler:
             if not desktop_path:
                 # Clean up on failure
                 self.manager.uninstall_appimage(info.appimage_path)
-                dialogs.show_error(
-                    "Installation Failed",
-                    "Could not create launcher shortcut."
-                )
+                self._show_error("Installation Failed", 'install_shortcut_failed')
                 return False
             
             # Update info with desktop file path
@@ -359,20 +399,13 @@ class AppImageHandler:
             self.desktop.create_desktop_shortcut(info)
             
             # Show success message
-            dialogs.show_info(
-                "Installation Successful",
-                f"'{info.name}' has been successfully installed!\n\n"
-                f"You can now find it in your applications menu."
-            )
+            self._show_info("Installation Successful", 'install_success', app_name=info.name)
             
             # Launch the application (use exec_command which points to the executable copy)
             return self._launch_appimage(info.exec_command, info.name)
             
         except Exception as e:
-            dialogs.show_error(
-                "Installation Error",
-                f"Error during installation: {str(e)}"
-            )
+            self._show_error("Installation Error", 'install_error', error=e)
             return False
     
     def _uninstall_appimage(self, info: AppImageInfo) -> bool:
@@ -397,18 +430,12 @@ class AppImageHandler:
             self.manager.uninstall_appimage(info.appimage_path)
             
             # Show success message
-            dialogs.show_info(
-                "Uninstall Successful",
-                f"'{info.name}' has been successfully uninstalled from your system."
-            )
+            self._show_info("Uninstall Successful", 'uninstall_success', app_name=info.name)
             
             return True
             
         except Exception as e:
-            dialogs.show_error(
-                "Uninstall Error",
-                f"Error during uninstallation: {str(e)}"
-            )
+            self._show_error("Uninstall Error", 'uninstall_error', error=e)
             return False
     
     def _launch_appimage(self, appimage_path: str, app_name: str) -> bool:
@@ -426,18 +453,11 @@ class AppImageHandler:
             if self.desktop.launch_appimage(appimage_path):
                 return True
             else:
-                dialogs.show_error(
-                    "Launch Failed",
-                    f"Could not launch '{app_name}'.\n\n"
-                    f"Please check that the AppImage file is valid and executable."
-                )
+                self._show_error("Launch Failed", 'launch_failed', app_name=app_name)
                 return False
                 
         except Exception as e:
-            dialogs.show_error(
-                "Launch Error",
-                f"Error launching '{app_name}': {str(e)}"
-            )
+            self._show_error("Launch Error", 'launch_error', app_name=app_name, error=e)
             return False
 
 
@@ -8,19 +8,175 @@ registry management, and installation/uninstallation tracking.
 import os
 import json
 import shutil
-import tempfile
-import subprocess
 import re
+import stat
+import struct
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
-import magic
-from PIL import Image
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+# Prefer orjson for registry (de)serialization when available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# ELF magic and AppImage type markers (type 1 and type 2) found at offset 8
+_ELF_MAGIC = b'\x7fELF'
+_APPIMAGE_TYPE_MAGICS = (b'AI\x01', b'AI\x02')
+_APPIMAGE_HEADER_SIZE = 12
+
+# Magic bytes at the start of the squashfs image embedded in type 2 AppImages
+_SQUASHFS_MAGIC = b'hsqs'
+
+# Desktop entry keys read from an AppImage's .desktop file, mapped to metadata keys
+_DESKTOP_KEY_RE = re.compile(
+    r'^[ \t]*(Name|Version|Comment|Categories|MimeType|Icon)=(.*?)[ \t\r]*$', re.MULTILINE
+)
+_DESKTOP_FIELDS = {
+    'Name': 'name',
+    'Version': 'version',
+    'Comment': 'description',
+    'Categories': 'categories',
+    'MimeType': 'mime_types',
+    'Icon': 'icon_name'
+}
+_DESKTOP_LIST_FIELDS = ('Categories', 'MimeType')
+
+# Icon format preferences (SVG > PNG > others) and size hints in icon filenames
+_ICON_FORMAT_SCORES = {'.svg': 1000, '.png': 500, '.ico': 200, '.xpm': 100}
+_RASTER_ICON_SUFFIXES = frozenset(('.png', '.ico', '.jpg', '.jpeg'))
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_ICON_SIZE_RE = re.compile(r'(\d+)x\d+')
+
+# Fallback icons guessed from words in the application name, checked in order
+_NAME_ICON_PATTERNS = tuple((re.compile(pattern), icon) for pattern, icon in (
+    ('browser|firefox|chrome|web', 'web-browser'),
+    ('editor|code|vim|emacs|atom|vscode', 'text-editor'),
+    ('player|vlc|media|video|music', 'multimedia-player'),
+    ('image|photo|gimp|inkscape|draw', 'image-viewer'),
+    ('game|play', 'applications-games'),
+    ('office|writer|calc|document', 'application-office'),
+    ('terminal|console|shell', 'utilities-terminal'),
+    ('mail|email|thunderbird', 'mail-client'),
+    ('chat|message|discord|telegram', 'chat'),
+    ('develop|ide|studio', 'applications-development')
+))
+
+# Fallback icons for freedesktop.org main categories
+_CATEGORY_ICONS = {
+    'AudioVideo': 'multimedia-player',
+    'Audio': 'multimedia-player', 
+    'Video': 'multimedia-player',
+    'Development': 'applications-development',
+    'Education': 'applications-education',
+    'Game': 'applications-games',
+    'Graphics': 'image-viewer',
+    'Network': 'applications-internet',
+    'Office': 'application-office',
+    'Science': 'applications-science',
+    'Settings': 'preferences-system',
+    'System': 'applications-system',
+    'Utility': 'applications-utilities',
+    'WebBrowser': 'web-browser',
+    'TextEditor': 'text-editor'
+}
+
+# Version, architecture and packaging noise stripped from app names
+_NAME_NOISE_RE = re.compile(
+    r'[-_\s]*(?:v?\d+\.\d+(?:\.\d+)?|x86_64|amd64|i386|arm64|aarch64|appimage|portable|linux)[-_\s]*'
+)
+_NAME_SEPARATORS_RE = re.compile(r'[-_\s]+')
+_VERSION_PART_RE = re.compile(r'\d+')
+
+# Runs of characters not allowed in stored filenames, underscores included so
+# that a run collapses to a single underscore
+_UNSAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9.-]+')
+
+# Icon download URLs for common applications (safe, well-known sources)
+_KNOWN_APP_ICON_URLS = {
+    'firefox': 'https://upload.wikimedia.org/wikipedia/commons/thumb/a/a0/Firefox_logo%2C_2019.svg/1024px-Firefox_logo%2C_2019.svg.png',
+    'chrome': 'https://upload.wikimedia.org/wikipedia/commons/thumb/a/a5/Google_Chrome_icon_%28September_2014%29.svg/1024px-Google_Chrome_icon_%28September_2014%29.svg.png',
+    'vlc': 'https://upload.wikimedia.org/wikipedia/commons/thumb/e/e6/VLC_Icon.svg/1024px-VLC_Icon.svg.png',
+    'gimp': 'https://upload.wikimedia.org/wikipedia/commons/thumb/4/45/The_GIMP_icon_-_gnome.svg/1024px-The_GIMP_icon_-_gnome.svg.png',
+    'inkscape': 'https://upload.wikimedia.org/wikipedia/commons/thumb/0/0d/Inkscape_Logo.svg/1024px-Inkscape_Logo.svg.png',
+    'blender': 'https://upload.wikimedia.org/wikipedia/commons/thumb/0/0c/Blender_logo_no_text.svg/1024px-Blender_logo_no_text.svg.png',
+    'krita': 'https://upload.wikimedia.org/wikipedia/commons/thumb/7/73/Calligrakrita-base.svg/1024px-Calligrakrita-base.svg.png',
+    'discord': 'https://assets-global.website-files.com/6257adef93867e50d84d30e2/636e0a6918e57475a843dcad_icon_clyde_black_RGB.png',
+    'telegram': 'https://upload.wikimedia.org/wikipedia/commons/thumb/8/82/Telegram_logo.svg/1024px-Telegram_logo.svg.png',
+    'vscode': 'https://upload.wikimedia.org/wikipedia/commons/thumb/9/9a/Visual_Studio_Code_1.35_icon.svg/1024px-Visual_Studio_Code_1.35_icon.svg.png'
+}
+_ICON_NAME_STRIP = str.maketrans('', '', ' -_')
+
+# Filename suffixes accepted as AppImages without inspecting the content
+_APPIMAGE_SUFFIXES = ('.AppImage', '.appimage')
+
+# Home and XDG base directories, resolved once per process
+_HOME_DIR = Path.home()
+_CONFIG_DIR = Path(os.environ.get('XDG_CONFIG_HOME') or _HOME_DIR / ".config")
+_DATA_DIR = Path(os.environ.get('XDG_DATA_HOME') or _HOME_DIR / ".local" / "share")
+
+# System icon theme directories, and the subdirectories searched in each of
+# them in order of preference ('' is the directory itself, as for pixmaps)
+_SYSTEM_ICON_DIRS = (
+    Path("/usr/share/icons/hicolor"),
+    Path("/usr/share/pixmaps"),
+    _HOME_DIR / ".local/share/icons/hicolor",
+    _HOME_DIR / ".icons"
+)
+_SYSTEM_ICON_SUBDIRS = ('scalable/apps', '', '48x48/apps', '64x64/apps', '32x32/apps', '128x128/apps')
+_SYSTEM_ICON_EXTENSIONS = ('.svg', '.png', '.xpm', '.ico')
+
+
+def _loads_registry(data: bytes) -> Dict:
+    """Decode registry JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_registry(registry: Dict) -> bytes:
+    """Encode the registry as indented JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(registry, option=orjson.OPT_INDENT_2)
+    return json.dumps(registry, indent=2).encode('utf-8')
+
+
+@lru_cache(maxsize=512)
+def _normalize_app_name(name: str) -> str:
+    """Normalize an application name for comparison (memoized)."""
+    # Convert to lowercase and remove common suffixes/prefixes
+    normalized = name.lower().strip()
+    
+    # Remove version numbers, architecture info, and common suffixes in one pass
+    normalized = _NAME_NOISE_RE.sub('', normalized)
+    
+    # Remove extra spaces and normalize separators
+    return _NAME_SEPARATORS_RE.sub(' ', normalized).strip()
+
+
+@lru_cache(maxsize=256)
+def _parse_pep440_version(version: str):
+    """Parse a PEP 440 version string, or return None if it is not one (memoized)."""
+    from packaging.version import Version, InvalidVersion
+    
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
 
 
 @dataclass
 class AppImageInfo:
     """Information about an AppImage file."""
+    __slots__ = (
+        'name', 'version', 'description', 'icon_path', 'desktop_file_path',
+        'appimage_path', 'exec_command', 'categories', 'mime_types', 'installed_date'
+    )
+    
     name: str
     version: str
     description: str
@@ -31,6 +187,37 @@ class AppImageInfo:
     categories: List[str]
     mime_types: List[str]
     installed_date: str
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert to a registry entry.
+        
+        Unlike dataclasses.asdict() this is a shallow conversion; the
+        categories and MIME type lists are shared, not deep-copied.
+        
+        Returns:
+            Dict: Field name to value mapping.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AppImageInfo':
+        """
+        Create from a registry entry, tolerating missing fields.
+        
+        Args:
+            data (Dict): Registry entry.
+            
+        Returns:
+            AppImageInfo: Information with missing fields left empty.
+        """
+        kwargs = {}
+        for field in fields(cls):
+            if field.name in data:
+                kwargs[field.name] = data[field.name]
+            else:
+                kwargs[field.name] = [] if field.name in ('categories', 'mime_types') else ''
+        return cls(**kwargs)
 
 
 class AppImageManager:
@@ -43,7 +230,7 @@ class AppImageManager:
     
     def __init__(self):
         """Initialize the AppImage manager with XDG-compliant paths."""
-        self.home_dir = Path.home()
+        self.home_dir = _HOME_DIR
         self.config_dir = self._get_config_dir()
         self.data_dir = self._get_data_dir()
         self.applications_dir = self.data_dir / "applications"
@@ -51,8 +238,24 @@ class AppImageManager:
         self.appimage_storage = self.home_dir / "Applications"
         self.registry_file = self.config_dir / "appimage-installer" / "registry.json"
         
-        # Create necessary directories
-        self._ensure_directories()
+        # Parsed registry cache, keyed by the registry file's (mtime, size)
+        self._registry_cache: Optional[Dict] = None
+        self._registry_stamp: Optional[Tuple[int, int]] = None
+        # Normalized app name -> registry keys, derived from the cached registry
+        self._name_index: Optional[Dict[str, List[str]]] = None
+        
+        # is_appimage() results keyed by (device, inode, mtime, size)
+        self._appimage_check_cache: Dict[Tuple[int, int, int, int], bool] = {}
+        # Per-theme {filename: path} indexes of system icons, keyed by the
+        # mtimes of the scanned directories
+        self._system_icon_index: Optional[List[Dict[str, str]]] = None
+        self._system_icon_stamp: Optional[Tuple] = None
+        
+        # Extracted AppImage metadata keyed by (path, mtime, size)
+        self._metadata_cache: Dict[Tuple[str, int, int], Optional[Dict]] = {}
+        
+        # Directories are created lazily, right before the first write
+        self._directories_ensured = False
     
     def _get_config_dir(self) -> Path:
         """
@@ -61,10 +264,7 @@ class AppImageManager:
         Returns:
             Path: XDG config directory path.
         """
-        xdg_config = os.environ.get('XDG_CONFIG_HOME')
-        if xdg_config:
-            return Path(xdg_config)
-        return self.home_dir / ".config"
+        return _CONFIG_DIR
     
     def _get_data_dir(self) -> Path:
         """
@@ -73,33 +273,38 @@ class AppImageManager:
         Returns:
             Path: XDG data directory path.
         """
-        xdg_data = os.environ.get('XDG_DATA_HOME')
-        if xdg_data:
-            return Path(xdg_data)
-        return self.home_dir / ".local" / "share"
+        return _DATA_DIR
     
     def _ensure_directories(self) -> None:
-        """Create necessary directories if they don't exist."""
+        """
+        Create necessary directories if they don't exist.
+        
+        Only runs once per manager instance. Icon size directories are created
+        on demand when an icon is actually written.
+        """
+        if self._directories_ensured:
+            return
+        
         directories = [
             self.config_dir / "appimage-installer",
             self.applications_dir,
-            self.icons_dir / "16x16" / "apps",
-            self.icons_dir / "24x24" / "apps", 
-            self.icons_dir / "32x32" / "apps",
-            self.icons_dir / "48x48" / "apps",
-            self.icons_dir / "64x64" / "apps",
-            self.icons_dir / "128x128" / "apps",
-            self.icons_dir / "256x256" / "apps",
             self.appimage_storage
         ]
         
+        # A single stat per directory on warm systems; makedirs only when missing
         for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+        
+        self._directories_ensured = True
     
     def is_appimage(self, file_path: str) -> bool:
         """
         Check if a file is a valid AppImage.
         
+        Results are memoized per file identity and modification stamp, so
+        repeated checks of an unchanged file cost a single stat call.
+        
         Args:
             file_path (str): Path to the file to check.
             
@@ -107,45 +312,72 @@ class AppImageManager:
             bool: True if the file is an AppImage, False otherwise.
         """
         try:
-            path = Path(file_path)
+            # A single stat covers existence, file type and change detection
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return False
             
-            # Check if file exists
-            if not path.exists():
+            if not stat.S_ISREG(st.st_mode):
                 return False
             
-            # Check filename pattern first (most reliable)
-            filename = path.name
-            if filename.endswith('.AppImage') or filename.endswith('.appimage'):
-                # For files with correct extension, do a quick content check
-                try:
-                    with open(path, 'rb') as f:
-                        # Read first 100KB to look for AppImage signature
-                        header = f.read(100 * 1024)
-                        if b'AppImage' in header or b'appimage' in header:
-                            return True
-                        # Even without signature, trust the filename
-                        return True
-                except Exception:
-                    # If can't read file, still trust the filename
-                    return True
+            cache_key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+            cached = self._appimage_check_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
-            # For files without .AppImage extension, check MIME type and content
-            try:
-                mime_type = magic.from_file(str(path), mime=True)
-                # Accept various executable types that might be AppImages
-                if mime_type in ['application/x-executable', 'application/x-sharedlib', 'application/octet-stream']:
-                    # Check for AppImage signature in content
-                    with open(path, 'rb') as f:
-                        header = f.read(100 * 1024)
-                        return b'AppImage' in header or b'appimage' in header
-            except Exception:
-                pass
-                
-            return False
+            result = self._check_appimage(file_path, st)
+            self._appimage_check_cache[cache_key] = result
+            return result
                 
         except Exception:
             return False
     
+    def _check_appimage(self, file_path: str, st: os.stat_result) -> bool:
+        """
+        Check a regular file for the AppImage filename pattern or magic bytes.
+        
+        Args:
+            file_path (str): Path to the file to check.
+            st (os.stat_result): Result of stat() on the file.
+            
+        Returns:
+            bool: True if the file is an AppImage, False otherwise.
+        """
+        # Trust the filename pattern without reading the file (most reliable)
+        filename = os.path.basename(file_path)
+        if filename.endswith(_APPIMAGE_SUFFIXES):
+            return st.st_size > 0
+        
+        # For files without .AppImage extension, check the AppImage magic bytes
+        if st.st_size < _APPIMAGE_HEADER_SIZE:
+            return False
+        
+        try:
+            return self._has_appimage_magic(file_path)
+        except OSError:
+            return False
+    
+    def _has_appimage_magic(self, file_path: str) -> bool:
+        """
+        Check the fixed-offset AppImage magic bytes of a file.
+        
+        AppImages are ELF executables carrying the type marker 'AI' followed by
+        0x01 (type 1) or 0x02 (type 2) at offset 8 of the ELF identification.
+        
+        Args:
+            file_path (str): Path to the file to check.
+            
+        Returns:
+            bool: True if the file header matches the AppImage magic.
+        """
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            header = os.read(fd, _APPIMAGE_HEADER_SIZE)
+        finally:
+            os.close(fd)
+        return header[:4] == _ELF_MAGIC and header[8:11] in _APPIMAGE_TYPE_MAGICS
+    
     def extract_appimage_info(self, appimage_path: str) -> Optional[AppImageInfo]:
         """
         Extract metadata and information from an AppImage file.
@@ -156,11 +388,14 @@ class AppImageManager:
         Returns:
             Optional[AppImageInfo]: Extracted information or None if extraction fails.
         """
+        # Callers such as AppImageHandler have usually validated the file just
+        # before; is_appimage() is memoized, so this re-check is a dict lookup
         if not self.is_appimage(appimage_path):
             return None
 
         try:
             path = Path(appimage_path)
+            abs_path = self._get_registry_key(appimage_path)
             
             # Start with basic info from filename as foundation
             basic_name = path.stem.replace('_', ' ').replace('-', ' ').title()
@@ -171,15 +406,15 @@ class AppImageManager:
                 description=f'AppImage application: {path.stem}',
                 icon_path='',
                 desktop_file_path='',
-                appimage_path=str(path.absolute()),
-                exec_command=str(path.absolute()),
+                appimage_path=abs_path,
+                exec_command=abs_path,
                 categories=['Application'],
                 mime_types=[],
                 installed_date=''
             )
             
             # Try to extract real metadata from AppImage
-            extracted_info = self._extract_appimage_metadata(appimage_path)
+            extracted_info = self._get_appimage_metadata(abs_path)
             if extracted_info:
                 # Update with extracted information
                 if extracted_info.get('name'):
@@ -203,6 +438,55 @@ class AppImageManager:
             print(f"Error extracting AppImage info: {e}")
             return None
     
+    def extract_many(self, appimage_paths: List[str], max_workers: int = 4) -> Dict[str, Optional[AppImageInfo]]:
+        """
+        Extract information from several AppImages concurrently.
+        
+        Extraction mostly waits on the AppImage's extractor subprocess and on
+        disk I/O, so running a few extractions side by side overlaps that time.
+        
+        Args:
+            appimage_paths (List[str]): Paths to the AppImage files.
+            max_workers (int): Maximum number of concurrent extractions.
+            
+        Returns:
+            Dict[str, Optional[AppImageInfo]]: Extracted information (or None)
+            keyed by the given paths.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Each path is extracted once; the caches are plain dicts whose single
+        # get/set operations are atomic, so workers can share them safely
+        unique_paths = list(dict.fromkeys(appimage_paths))
+        if len(unique_paths) <= 1 or max_workers <= 1:
+            return {path: self.extract_appimage_info(path) for path in unique_paths}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_paths))) as executor:
+            results = executor.map(self.extract_appimage_info, unique_paths)
+            return dict(zip(unique_paths, results))
+    
+    def _get_appimage_metadata(self, appimage_path: str) -> Optional[Dict]:
+        """
+        Get extracted AppImage metadata, reusing earlier results for unchanged files.
+        
+        Args:
+            appimage_path (str): Absolute path to the AppImage file.
+            
+        Returns:
+            Optional[Dict]: Extracted metadata or None if extraction fails.
+        """
+        try:
+            st = os.stat(appimage_path)
+        except OSError:
+            return None
+        
+        cache_key = (appimage_path, st.st_mtime_ns, st.st_size)
+        if cache_key not in self._metadata_cache:
+            self._metadata_cache[cache_key] = self._extract_appimage_metadata(appimage_path)
+        
+        metadata = self._metadata_cache[cache_key]
+        return dict(metadata) if metadata is not None else None
+    
     def _extract_appimage_metadata(self, appimage_path: str) -> Optional[Dict]:
         """
         Extract metadata from AppImage using appimage-extract.
@@ -215,51 +499,159 @@ class AppImageManager:
         """
         try:
             import tempfile
-            import subprocess
             
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
                 
-                # Copy AppImage to temp directory and make executable
-                appimage_copy = temp_path / "app.AppImage"
-                shutil.copy2(appimage_path, appimage_copy)
-                os.chmod(appimage_copy, 0o755)
+                # Run executable AppImages in place; only copy the file to the
+                # temp directory when it has to be made executable
+                if os.access(appimage_path, os.X_OK):
+                    appimage_exec = Path(appimage_path)
+                else:
+                    appimage_exec = temp_path / "app.AppImage"
+                    shutil.copy2(appimage_path, appimage_exec)
+                    os.chmod(appimage_exec, 0o755)
                 
-                # Extract AppImage contents
-                result = subprocess.run([
-                    str(appimage_copy), '--appimage-extract'
-                ], cwd=temp_path, capture_output=True, timeout=30)
+                squashfs_root = temp_path / "squashfs-root"
                 
-                if result.returncode != 0:
+                # Extract only the top-level desktop file
+                if not self._run_appimage_extract(appimage_exec, temp_path, "*.desktop"):
                     return None
+                desktop_files = [f for f in squashfs_root.glob("*.desktop") if f.is_file()]
                 
-                # Look for desktop files in extracted contents
-                squashfs_root = temp_path / "squashfs-root"
-                if not squashfs_root.exists():
-                    return None
+                if not desktop_files:
+                    # It is usually a symlink into usr/share/applications;
+                    # extract just its target, or all application entries
+                    pattern = self._get_desktop_link_target(squashfs_root) or "usr/share/applications/*.desktop"
+                    if not self._run_appimage_extract(appimage_exec, temp_path, pattern):
+                        return None
+                    desktop_files = [f for f in squashfs_root.glob(pattern) if f.is_file()]
                 
-                # Find main desktop file
-                desktop_files = list(squashfs_root.glob("*.desktop"))
                 if not desktop_files:
-                    # Look in usr/share/applications
-                    desktop_files = list(squashfs_root.glob("usr/share/applications/*.desktop"))
+                    return None
                 
-                if desktop_files:
-                    return self._parse_desktop_file(desktop_files[0], squashfs_root)
+                metadata = self._parse_desktop_file(desktop_files[0])
                 
-                return None
+                # Extract the referenced icon from the most likely locations
+                # first, and only unpack everything as a last resort
+                icon_name = metadata.pop('icon_name', None)
+                if icon_name:
+                    for pattern in (f"{icon_name}*", "usr/share/icons", "usr/share/pixmaps", None):
+                        if not self._run_appimage_extract(appimage_exec, temp_path, pattern):
+                            break
+                        icon_path = self._extract_icon_from_appimage(icon_name, squashfs_root)
+                        if icon_path:
+                            metadata['icon_path'] = icon_path
+                            break
+                
+                return metadata
                 
         except Exception as e:
             print(f"Error extracting AppImage metadata: {e}")
             return None
     
-    def _parse_desktop_file(self, desktop_file: Path, squashfs_root: Path) -> Dict:
+    def _get_desktop_link_target(self, squashfs_root: Path) -> Optional[str]:
+        """
+        Get the in-image path a top-level desktop file symlink points to.
+        
+        Args:
+            squashfs_root (Path): Root of the partially extracted AppImage.
+            
+        Returns:
+            Optional[str]: Target path relative to the image root, or None.
+        """
+        for link in squashfs_root.glob("*.desktop"):
+            if not link.is_symlink():
+                continue
+            target = os.path.normpath(os.readlink(link))
+            # Absolute or escaping links point outside the image
+            if not os.path.isabs(target) and not target.startswith('..'):
+                return target
+        return None
+    
+    def _run_appimage_extract(self, appimage_exec: Path, cwd: Path, pattern: Optional[str] = None) -> bool:
+        """
+        Run an AppImage's built-in extractor into cwd/squashfs-root.
+        
+        Args:
+            appimage_exec (Path): Executable AppImage to run.
+            cwd (Path): Directory to extract into.
+            pattern (Optional[str]): Only extract paths matching this pattern.
+            
+        Returns:
+            bool: True if extraction succeeded, False otherwise.
+        """
+        import subprocess
+        
+        # Read the embedded squashfs directly when squashfs-tools is available,
+        # which avoids starting the AppImage runtime
+        unsquashfs = shutil.which('unsquashfs')
+        offset = self._get_squashfs_offset(appimage_exec) if unsquashfs else None
+        if offset is not None:
+            command = [
+                unsquashfs, '-o', str(offset), '-d', str(cwd / "squashfs-root"),
+                '-f', '-n', str(appimage_exec)
+            ]
+            if pattern:
+                command.append(pattern)
+            
+            result = subprocess.run(command, cwd=cwd, capture_output=True, timeout=30)
+            if result.returncode == 0:
+                return True
+        
+        command = [str(appimage_exec), '--appimage-extract']
+        if pattern:
+            command.append(pattern)
+        
+        result = subprocess.run(command, cwd=cwd, capture_output=True, timeout=30)
+        return result.returncode == 0
+    
+    def _get_squashfs_offset(self, appimage_path: Path) -> Optional[int]:
+        """
+        Get the offset of the squashfs image appended to a type 2 AppImage.
+        
+        The image starts right after the ELF section header table of the runtime.
+        
+        Args:
+            appimage_path (Path): Path to the AppImage file.
+            
+        Returns:
+            Optional[int]: Offset of the squashfs image or None if not found.
+        """
+        try:
+            with open(appimage_path, 'rb') as f:
+                header = f.read(64)
+                if len(header) < 64 or header[:4] != _ELF_MAGIC:
+                    return None
+                
+                # EI_CLASS selects the 32/64-bit layout, EI_DATA the byte order
+                endian = '<' if header[5] == 1 else '>'
+                if header[4] == 2:
+                    shoff, = struct.unpack_from(endian + 'Q', header, 0x28)
+                    shentsize, shnum = struct.unpack_from(endian + 'HH', header, 0x3A)
+                else:
+                    shoff, = struct.unpack_from(endian + 'I', header, 0x20)
+                    shentsize, shnum = struct.unpack_from(endian + 'HH', header, 0x2E)
+                
+                offset = shoff + shentsize * shnum
+                f.seek(offset)
+                if f.read(len(_SQUASHFS_MAGIC)) != _SQUASHFS_MAGIC:
+                    return None
+                
+                return offset
+                
+        except (OSError, struct.error):
+            return None
+    
+    def _parse_desktop_file(self, desktop_file: Path) -> Dict:
         """
         Parse desktop file to extract application metadata.
         
+        The Icon= value is returned as 'icon_name' so the caller can extract
+        the icon itself.
+        
         Args:
             desktop_file (Path): Path to desktop file.
-            squashfs_root (Path): Root of extracted AppImage.
             
         Returns:
             Dict: Parsed metadata.
@@ -270,27 +662,13 @@ class AppImageManager:
             with open(desktop_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Parse desktop file
-            for line in content.split('\n'):
-                line = line.strip()
-                if '=' in line and not line.startswith('#'):
-                    key, value = line.split('=', 1)
-                    
-                    if key == 'Name':
-                        metadata['name'] = value
-                    elif key == 'Version':
-                        metadata['version'] = value
-                    elif key == 'Comment':
-                        metadata['description'] = value
-                    elif key == 'Categories':
-                        metadata['categories'] = [cat.strip() for cat in value.split(';') if cat.strip()]
-                    elif key == 'MimeType':
-                        metadata['mime_types'] = [mime.strip() for mime in value.split(';') if mime.strip()]
-                    elif key == 'Icon':
-                        # Handle icon extraction
-                        icon_path = self._extract_icon_from_appimage(value, squashfs_root)
-                        if icon_path:
-                            metadata['icon_path'] = icon_path
+            # Parse desktop file in a single pass; later keys override earlier ones
+            for match in _DESKTOP_KEY_RE.finditer(content):
+                key, value = match.groups()
+                if key in _DESKTOP_LIST_FIELDS:
+                    metadata[_DESKTOP_FIELDS[key]] = [item.strip() for item in value.split(';') if item.strip()]
+                else:
+                    metadata[_DESKTOP_FIELDS[key]] = value
             
             return metadata
             
@@ -310,37 +688,38 @@ class AppImageManager:
             Optional[str]: Path to extracted icon or None.
         """
         try:
-            # Common icon locations in AppImages
-            icon_locations = [
-                squashfs_root / icon_name,
-                squashfs_root / f"{icon_name}.png",
-                squashfs_root / f"{icon_name}.svg",
-                squashfs_root / f"{icon_name}.ico",
-                squashfs_root / f"{icon_name}.xpm",
-                squashfs_root / "usr" / "share" / "icons" / "hicolor" / "**" / f"{icon_name}.*",
-                squashfs_root / "usr" / "share" / "pixmaps" / f"{icon_name}.*",
-                squashfs_root / "**" / f"{icon_name}.*"
-            ]
+            # The icon may be referenced by its path relative to the AppImage root
+            candidates = []
+            exact_path = squashfs_root / icon_name
+            if exact_path.is_file():
+                candidates.append(exact_path)
+            
+            # Also collect every "<icon_name>.<ext>" file in a single walk;
+            # os.walk is top-down, so files at the root are considered first
+            icon_prefix = f"{icon_name}."
+            for root, _dirs, files in os.walk(squashfs_root):
+                for filename in files:
+                    if filename.startswith(icon_prefix):
+                        icon_file = Path(root) / filename
+                        if icon_file.is_file():
+                            candidates.append(icon_file)
+            
+            # SVGs outscore every raster format, so when there is one the
+            # raster candidates never need their headers read
+            svg_candidates = [f for f in candidates if f.suffix.lower() == '.svg']
+            if svg_candidates:
+                candidates = svg_candidates
             
             # Find the best icon
             best_icon = None
             best_size = 0
             
-            for location_pattern in icon_locations:
-                if '*' in str(location_pattern):
-                    # Use glob for patterns
-                    matches = list(squashfs_root.glob(str(location_pattern).replace(str(squashfs_root) + '/', '')))
-                else:
-                    # Direct file check
-                    matches = [location_pattern] if location_pattern.exists() else []
-                
-                for icon_file in matches:
-                    if icon_file.is_file():
-                        # Prefer larger icons and certain formats
-                        size_score = self._get_icon_size_score(icon_file)
-                        if size_score > best_size:
-                            best_icon = icon_file
-                            best_size = size_score
+            for icon_file in candidates:
+                # Prefer larger icons and certain formats
+                size_score = self._get_icon_size_score(icon_file)
+                if size_score > best_size:
+                    best_icon = icon_file
+                    best_size = size_score
             
             if best_icon:
                 # Copy icon to our icons directory
@@ -363,16 +742,15 @@ class AppImageManager:
             int: Score (higher is better).
         """
         try:
-            # Format preferences (SVG > PNG > others)
-            format_scores = {'.svg': 1000, '.png': 500, '.ico': 200, '.xpm': 100}
-            base_score = format_scores.get(icon_file.suffix.lower(), 50)
+            suffix = icon_file.suffix.lower()
+            base_score = _ICON_FORMAT_SCORES.get(suffix, 50)
             
             # Try to get actual image size for raster formats
-            if icon_file.suffix.lower() in ['.png', '.ico', '.jpg', '.jpeg']:
+            if suffix in _RASTER_ICON_SUFFIXES:
                 try:
-                    from PIL import Image
-                    with Image.open(icon_file) as img:
-                        width, height = img.size
+                    dimensions = self._read_icon_dimensions(icon_file, suffix)
+                    if dimensions:
+                        width, height = dimensions
                         # Prefer icons around 48-128px
                         size = min(width, height)
                         if 48 <= size <= 128:
@@ -386,8 +764,7 @@ class AppImageManager:
             
             # Guess size from filename (e.g., "48x48", "128x128")
             filename = icon_file.name.lower()
-            import re
-            size_match = re.search(r'(\d+)x\d+', filename)
+            size_match = _ICON_SIZE_RE.search(filename)
             if size_match:
                 size = int(size_match.group(1))
                 return base_score + min(size, 128)
@@ -397,6 +774,48 @@ class AppImageManager:
         except:
             return 1
     
+    def _read_icon_dimensions(self, icon_file: Path, suffix: str) -> Optional[Tuple[int, int]]:
+        """
+        Read the pixel dimensions of a raster icon.
+        
+        PNG and ICO sizes are read from their fixed-layout headers; other
+        formats are opened with Pillow.
+        
+        Args:
+            icon_file (Path): Path to icon file.
+            suffix (str): Lowercase file suffix of the icon.
+            
+        Returns:
+            Optional[Tuple[int, int]]: Width and height, or None if unknown.
+        """
+        if suffix == '.png':
+            with open(icon_file, 'rb') as f:
+                header = f.read(24)
+            if len(header) < 24 or header[:8] != _PNG_SIGNATURE or header[12:16] != b'IHDR':
+                return None
+            return struct.unpack('>II', header[16:24])
+        
+        if suffix == '.ico':
+            with open(icon_file, 'rb') as f:
+                header = f.read(6)
+                if len(header) < 6:
+                    return None
+                reserved, icon_type, count = struct.unpack('<HHH', header)
+                if reserved != 0 or icon_type != 1 or count == 0:
+                    return None
+                entries = f.read(16 * count)
+            
+            # Like Pillow, report the largest image; a stored 0 means 256px
+            sizes = [
+                (entries[i] or 256, entries[i + 1] or 256)
+                for i in range(0, len(entries) - 15, 16)
+            ]
+            return max(sizes, key=lambda size: size[0] * size[1]) if sizes else None
+        
+        from PIL import Image
+        with Image.open(icon_file) as img:
+            return img.size
+    
     def _copy_icon_to_storage(self, icon_file: Path) -> str:
         """
         Copy icon to our icon storage directory.
@@ -408,16 +827,11 @@ class AppImageManager:
             str: Path to copied icon.
         """
         try:
-            # Create icon filename based on app
-            import hashlib
-            import time
+            import secrets
             
             # Create unique filename
-            timestamp = str(int(time.time()))
-            source_hash = hashlib.md5(str(icon_file).encode()).hexdigest()[:8]
             extension = icon_file.suffix or '.png'
-            
-            icon_filename = f"extracted_{timestamp}_{source_hash}{extension}"
+            icon_filename = f"extracted_{secrets.token_hex(8)}{extension}"
             
             # Determine best size directory (prefer 48x48 for desktop files)
             icon_dir = self.icons_dir / "48x48" / "apps"
@@ -524,40 +938,9 @@ class AppImageManager:
         Returns:
             List[str]: List of potential icon URLs.
         """
-        name_lower = app_name.lower().replace(' ', '').replace('-', '').replace('_', '')
-        
-        # Common icon sources and patterns
-        icon_urls = []
-        
-        # Known application icons (safe, common apps)
-        known_apps = {
-            'firefox': 'https://upload.wikimedia.org/wikipedia/commons/thumb/a/a0/Firefox_logo%2C_2019.svg/1024px-Firefox_logo%2C_2019.svg.png',
-            'chrome': 'https://upload.wikimedia.org/wikipedia/commons/thumb/a/a5/Google_Chrome_icon_%28September_2014%29.svg/1024px-Google_Chrome_icon_%28September_2014%29.svg.png',
-            'vlc': 'https://upload.wikimedia.org/wikipedia/commons/thumb/e/e6/VLC_Icon.svg/1024px-VLC_Icon.svg.png',
-            'gimp': 'https://upload.wikimedia.org/wikipedia/commons/thumb/4/45/The_GIMP_icon_-_gnome.svg/1024px-The_GIMP_icon_-_gnome.svg.png',
-            'inkscape': 'https://upload.wikimedia.org/wikipedia/commons/thumb/0/0d/Inkscape_Logo.svg/1024px-Inkscape_Logo.svg.png',
-            'blender': 'https://upload.wikimedia.org/wikipedia/commons/thumb/0/0c/Blender_logo_no_text.svg/1024px-Blender_logo_no_text.svg.png',
-            'krita': 'https://upload.wikimedia.org/wikipedia/commons/thumb/7/73/Calligrakrita-base.svg/1024px-Calligrakrita-base.svg.png',
-            'discord': 'https://assets-global.website-files.com/6257adef93867e50d84d30e2/636e0a6918e57475a843dcad_icon_clyde_black_RGB.png',
-            'telegram': 'https://upload.wikimedia.org/wikipedia/commons/thumb/8/82/Telegram_logo.svg/1024px-Telegram_logo.svg.png',
-            'vscode': 'https://upload.wikimedia.org/wikipedia/commons/thumb/9/9a/Visual_Studio_Code_1.35_icon.svg/1024px-Visual_Studio_Code_1.35_icon.svg.png',
-        }
-        
-        if name_lower in known_apps:
-            icon_urls.append(known_apps[name_lower])
-        
-        # Alternative patterns to try
-        search_variations = [
-            name_lower,
-            app_name.lower().replace(' ', '-'),
-            app_name.lower().replace(' ', '_'),
-        ]
-        
-        for variation in search_variations:
-            if variation in known_apps:
-                icon_urls.append(known_apps[variation])
-        
-        return icon_urls
+        # Known apps are keyed by their lowercase name without separators
+        icon_url = _KNOWN_APP_ICON_URLS.get(app_name.lower().translate(_ICON_NAME_STRIP))
+        return [icon_url] if icon_url else []
     
     def _find_system_icon(self, app_name: str) -> Optional[str]:
         """
@@ -570,14 +953,6 @@ class AppImageManager:
             Optional[str]: Icon name if found in system.
         """
         try:
-            # Common system icon locations
-            icon_theme_dirs = [
-                Path("/usr/share/icons/hicolor"),
-                Path("/usr/share/pixmaps"),
-                Path.home() / ".local/share/icons/hicolor",
-                Path.home() / ".icons"
-            ]
-            
             # Generate possible icon names
             search_names = [
                 app_name.lower(),
@@ -586,28 +961,63 @@ class AppImageManager:
                 app_name.lower().replace(' ', ''),
             ]
             
-            for theme_dir in icon_theme_dirs:
-                if not theme_dir.exists():
-                    continue
-                    
+            for theme_index in self._get_system_icon_index():
                 for icon_name in search_names:
                     # Look for icons in various formats
-                    for ext in ['.svg', '.png', '.xpm', '.ico']:
-                        for size_dir in ['scalable', '48x48', '64x64', '32x32', '128x128']:
-                            icon_paths = [
-                                theme_dir / size_dir / "apps" / f"{icon_name}{ext}",
-                                theme_dir / f"{icon_name}{ext}",  # For pixmaps
-                            ]
-                            
-                            for icon_path in icon_paths:
-                                if icon_path.exists():
-                                    return str(icon_path)
+                    for ext in _SYSTEM_ICON_EXTENSIONS:
+                        icon_path = theme_index.get(f"{icon_name}{ext}")
+                        if icon_path:
+                            return icon_path
             
             return None
             
         except:
             return None
     
+    def _get_system_icon_index(self) -> List[Dict[str, str]]:
+        """
+        Get filename indexes of the system icon theme directories.
+        
+        The directories are listed once and listed again only when one of
+        their modification times changes.
+        
+        Returns:
+            List[Dict[str, str]]: One {filename: path} index per theme directory,
+            in search order; within a theme the preferred subdirectory wins.
+        """
+        scan_dirs = [
+            [theme_dir / subdir if subdir else theme_dir for subdir in _SYSTEM_ICON_SUBDIRS]
+            for theme_dir in _SYSTEM_ICON_DIRS
+        ]
+        
+        stamp = []
+        for theme_scan_dirs in scan_dirs:
+            for scan_dir in theme_scan_dirs:
+                try:
+                    stamp.append(os.stat(scan_dir).st_mtime_ns)
+                except OSError:
+                    stamp.append(None)
+        stamp = tuple(stamp)
+        
+        if self._system_icon_index is None or stamp != self._system_icon_stamp:
+            system_icon_index = []
+            for theme_scan_dirs in scan_dirs:
+                theme_index = {}
+                for scan_dir in theme_scan_dirs:
+                    try:
+                        with os.scandir(scan_dir) as entries:
+                            for entry in entries:
+                                if entry.name.endswith(_SYSTEM_ICON_EXTENSIONS):
+                                    theme_index.setdefault(entry.name, entry.path)
+                    except OSError:
+                        continue
+                system_icon_index.append(theme_index)
+            
+            self._system_icon_index = system_icon_index
+            self._system_icon_stamp = stamp
+        
+        return self._system_icon_index
+    
     def _get_category_icon(self, app_name: str, categories: List[str]) -> str:
         """
         Get appropriate icon based on application category and name heuristics.
@@ -622,54 +1032,34 @@ class AppImageManager:
         name_lower = app_name.lower()
         
         # Filename/name-based heuristics
-        if any(word in name_lower for word in ['browser', 'firefox', 'chrome', 'web']):
-            return 'web-browser'
-        elif any(word in name_lower for word in ['editor', 'code', 'vim', 'emacs', 'atom', 'vscode']):
-            return 'text-editor'
-        elif any(word in name_lower for word in ['player', 'vlc', 'media', 'video', 'music']):
-            return 'multimedia-player'
-        elif any(word in name_lower for word in ['image', 'photo', 'gimp', 'inkscape', 'draw']):
-            return 'image-viewer'
-        elif any(word in name_lower for word in ['game', 'play']):
-            return 'applications-games'
-        elif any(word in name_lower for word in ['office', 'writer', 'calc', 'document']):
-            return 'application-office'
-        elif any(word in name_lower for word in ['terminal', 'console', 'shell']):
-            return 'utilities-terminal'
-        elif any(word in name_lower for word in ['mail', 'email', 'thunderbird']):
-            return 'mail-client'
-        elif any(word in name_lower for word in ['chat', 'message', 'discord', 'telegram']):
-            return 'chat'
-        elif any(word in name_lower for word in ['develop', 'ide', 'studio']):
-            return 'applications-development'
+        for pattern, icon in _NAME_ICON_PATTERNS:
+            if pattern.search(name_lower):
+                return icon
         
         # Category-based mapping
         if categories:
-            category_map = {
-                'AudioVideo': 'multimedia-player',
-                'Audio': 'multimedia-player', 
-                'Video': 'multimedia-player',
-                'Development': 'applications-development',
-                'Education': 'applications-education',
-                'Game': 'applications-games',
-                'Graphics': 'image-viewer',
-                'Network': 'applications-internet',
-                'Office': 'application-office',
-                'Science': 'applications-science',
-                'Settings': 'preferences-system',
-                'System': 'applications-system',
-                'Utility': 'applications-utilities',
-                'WebBrowser': 'web-browser',
-                'TextEditor': 'text-editor'
-            }
-            
             for category in categories:
-                if category in category_map:
-                    return category_map[category]
+                if category in _CATEGORY_ICONS:
+                    return _CATEGORY_ICONS[category]
         
         # Default fallback
         return 'application-x-executable'
     
+    def _get_registry_key(self, appimage_path: str) -> str:
+        """
+        Get the registry key (absolute path) for an AppImage path.
+        
+        Every path is normalized the same way, so one file always maps to
+        one key whether it was given as an absolute or a relative path.
+        
+        Args:
+            appimage_path (str): Path to the AppImage file.
+            
+        Returns:
+            str: Absolute path used as registry key.
+        """
+        return os.path.abspath(appimage_path)
+    
     def is_registered(self, appimage_path: str) -> bool:
         """
         Check if an AppImage is registered in the system.
@@ -680,8 +1070,8 @@ class AppImageManager:
         Returns:
             bool: True if registered, False otherwise.
         """
-        registry = self._load_registry()
-        abs_path = str(Path(appimage_path).absolute())
+        registry = self._get_cached_registry()
+        abs_path = self._get_registry_key(appimage_path)
         return abs_path in registry
     
     def install_appimage(self, info: AppImageInfo) -> bool:
@@ -695,6 +1085,8 @@ class AppImageManager:
             bool: True if installation successful, False otherwise.
         """
         try:
+            self._ensure_directories()
+            
             # Copy AppImage to storage directory
             copied_path = self._copy_to_storage(info.appimage_path, info.name)
             if not copied_path:
@@ -710,6 +1102,107 @@ class AppImageManager:
             print(f"Error installing AppImage: {e}")
             return False
     
+    def replace_appimage(self, existing_info: AppImageInfo, new_info: AppImageInfo) -> bool:
+        """
+        Replace an installed AppImage with a new version.
+        
+        When the new copy keeps the old file name it is swapped in with a single
+        rename, and the registry is rewritten once for both entries.
+        
+        Args:
+            existing_info (AppImageInfo): Information about the installed version.
+            new_info (AppImageInfo): Information about the new version to install.
+            
+        Returns:
+            bool: True if the replacement was successful, False otherwise.
+        """
+        try:
+            self._ensure_directories()
+            
+            # Only ever touch executables that live in our storage directory
+            old_exec_path = Path(existing_info.exec_command) if existing_info.exec_command else None
+            if old_exec_path and old_exec_path.parent != self.appimage_storage:
+                old_exec_path = None
+            
+            safe_name, extension = self._get_storage_filename(new_info.appimage_path, new_info.name)
+            target_path = self.appimage_storage / f"{safe_name}{extension}"
+            
+            replaces_in_place = old_exec_path == target_path
+            if replaces_in_place:
+                copied_path = self._copy_over(new_info.appimage_path, target_path)
+            else:
+                copied_path = self._copy_to_storage(new_info.appimage_path, new_info.name)
+            
+            if not copied_path:
+                return False
+            
+            # Update exec command to point to the copy
+            new_info.exec_command = str(copied_path)
+            
+            if not self.replace_registration(existing_info.appimage_path, new_info):
+                if not replaces_in_place:
+                    copied_path.unlink(missing_ok=True)
+                return False
+            
+            # The old executable goes only once the new entry is registered, so
+            # a failed replacement leaves the installed version working
+            if not replaces_in_place and old_exec_path and old_exec_path.exists():
+                old_exec_path.unlink()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error replacing AppImage: {e}")
+            return False
+    
+    def _get_storage_filename(self, appimage_path: str, app_name: str) -> Tuple[str, str]:
+        """
+        Get the base name and extension for an AppImage copy in storage.
+        
+        Args:
+            appimage_path (str): Original AppImage path.
+            app_name (str): Application name for filename.
+            
+        Returns:
+            Tuple[str, str]: Sanitized base name and file extension.
+        """
+        suffix = Path(appimage_path).suffix
+        return self._sanitize_filename(app_name), suffix if suffix else '.AppImage'
+    
+    def _copy_over(self, appimage_path: str, target_path: Path) -> Optional[Path]:
+        """
+        Atomically replace a stored AppImage with a copy of another file.
+        
+        Args:
+            appimage_path (str): Source AppImage path.
+            target_path (Path): Stored AppImage to replace.
+            
+        Returns:
+            Optional[Path]: Path to the replaced file or None if failed.
+        """
+        temp_name = None
+        try:
+            import tempfile
+            
+            fd, temp_name = tempfile.mkstemp(dir=target_path.parent, prefix='.', suffix='.tmp')
+            os.close(fd)
+            shutil.copy2(appimage_path, temp_name)
+            os.chmod(temp_name, 0o755)
+            os.replace(temp_name, target_path)
+            temp_name = None
+            
+            return target_path
+            
+        except Exception as e:
+            print(f"Error copying AppImage to storage: {e}")
+            return None
+        finally:
+            if temp_name:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+    
     def _copy_to_storage(self, appimage_path: str, app_name: str) -> Optional[Path]:
         """
         Copy AppImage to storage directory and make it executable.
@@ -725,24 +1218,18 @@ class AppImageManager:
             source_path = Path(appimage_path)
             
             # Create safe filename
-            safe_name = self._sanitize_filename(app_name)
-            extension = source_path.suffix if source_path.suffix else '.AppImage'
-            target_filename = f"{safe_name}{extension}"
-            target_path = self.appimage_storage / target_filename
-            
-            # Handle filename conflicts
-            counter = 1
-            while target_path.exists():
-                name_part = safe_name
-                target_filename = f"{name_part}_{counter}{extension}"
-                target_path = self.appimage_storage / target_filename
-                counter += 1
-            
-            # Copy file
-            shutil.copy2(source_path, target_path)
+            safe_name, extension = self._get_storage_filename(appimage_path, app_name)
+            target_path = self._reserve_storage_path(safe_name, extension)
             
-            # Make copy executable
-            os.chmod(target_path, 0o755)
+            try:
+                # Copy file over the reserved placeholder
+                shutil.copy2(source_path, target_path)
+                
+                # Make copy executable
+                os.chmod(target_path, 0o755)
+            except Exception:
+                target_path.unlink(missing_ok=True)
+                raise
             
             return target_path
             
@@ -750,6 +1237,32 @@ class AppImageManager:
             print(f"Error copying AppImage to storage: {e}")
             return None
     
+    def _reserve_storage_path(self, safe_name: str, extension: str) -> Path:
+        """
+        Atomically claim a free filename in the storage directory.
+        
+        The file is created empty with O_EXCL, so concurrent installs can never
+        pick the same name. Conflicts get a numeric suffix (App_1, App_2, ...).
+        
+        Args:
+            safe_name (str): Sanitized base filename.
+            extension (str): File extension including the dot.
+            
+        Returns:
+            Path: Path of the newly created placeholder file.
+        """
+        counter = 0
+        while True:
+            suffix = f"_{counter}" if counter else ""
+            target_path = self.appimage_storage / f"{safe_name}{suffix}{extension}"
+            try:
+                fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o755)
+            except FileExistsError:
+                counter += 1
+                continue
+            os.close(fd)
+            return target_path
+    
     def _sanitize_filename(self, name: str) -> str:
         """
         Sanitize a name for use as filename.
@@ -760,15 +1273,8 @@ class AppImageManager:
         Returns:
             str: Sanitized filename.
         """
-        # Remove invalid characters and replace spaces
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-"
-        sanitized = "".join(c if c in safe_chars else "_" for c in name)
-        
-        # Remove multiple underscores and trim
-        while "__" in sanitized:
-            sanitized = sanitized.replace("__", "_")
-        
-        return sanitized.strip("_")
+        # Replace invalid characters and spaces, collapsing runs of underscores
+        return _UNSAFE_FILENAME_RE.sub("_", name).strip("_")
     
     def register_appimage(self, info: AppImageInfo) -> bool:
         """
@@ -781,20 +1287,82 @@ class AppImageManager:
             bool: True if registration successful, False otherwise.
         """
         try:
-            registry = self._load_registry()
-            abs_path = str(Path(info.appimage_path).absolute())
+            self._ensure_directories()
+            
+            abs_path = self._get_registry_key(info.appimage_path)
             
             # Add current timestamp
-            from datetime import datetime
             info.installed_date = datetime.now().isoformat()
             
-            registry[abs_path] = asdict(info)
-            return self._save_registry(registry)
+            def add_entry(registry: Dict) -> bool:
+                registry[abs_path] = info.to_dict()
+                return True
+            
+            return self._mutate_registry(add_entry)
             
         except Exception as e:
             print(f"Error registering AppImage: {e}")
             return False
     
+    def replace_registration(self, old_appimage_path: str, info: AppImageInfo) -> bool:
+        """
+        Replace a registry entry with a new one in a single registry write.
+        
+        Args:
+            old_appimage_path (str): Path of the AppImage to unregister.
+            info (AppImageInfo): AppImage information to register.
+            
+        Returns:
+            bool: True if the registry was updated, False otherwise.
+        """
+        try:
+            self._ensure_directories()
+            
+            old_abs_path = self._get_registry_key(old_appimage_path)
+            abs_path = self._get_registry_key(info.appimage_path)
+            
+            # Add current timestamp
+            info.installed_date = datetime.now().isoformat()
+            
+            def replace_entry(registry: Dict) -> bool:
+                registry.pop(old_abs_path, None)
+                registry[abs_path] = info.to_dict()
+                return True
+            
+            return self._mutate_registry(replace_entry)
+            
+        except Exception as e:
+            print(f"Error updating AppImage registration: {e}")
+            return False
+    
+    def update_icon_path(self, appimage_path: str, icon_path: str) -> bool:
+        """
+        Record a new icon for a registered AppImage.
+        
+        Args:
+            appimage_path (str): Path to the original AppImage file.
+            icon_path (str): New icon path or icon name.
+            
+        Returns:
+            bool: True if the registry is up to date, False otherwise.
+        """
+        try:
+            abs_path = self._get_registry_key(appimage_path)
+            
+            def set_icon(registry: Dict) -> bool:
+                data = registry.get(abs_path)
+                if data is None:
+                    return False
+                # Replace the entry; the cached one is shared and never modified
+                registry[abs_path] = {**data, 'icon_path': icon_path}
+                return True
+            
+            return self._mutate_registry(set_icon)
+            
+        except Exception as e:
+            print(f"Error updating AppImage icon: {e}")
+            return False
+    
     def uninstall_appimage(self, appimage_path: str) -> bool:
         """
         Uninstall an AppImage by removing copied file and registry entry.
@@ -806,16 +1374,23 @@ class AppImageManager:
             bool: True if uninstallation successful, False otherwise.
         """
         try:
-            # Get registered info to find the copied file
-            info = self.get_registered_info(appimage_path)
-            if info and info.exec_command:
+            abs_path = self._get_registry_key(appimage_path)
+            
+            def remove_entry(registry: Dict) -> bool:
+                data = registry.pop(abs_path, None)
+                if data is None:
+                    return False  # Already not registered
+                
                 # Remove the copied executable file
-                exec_path = Path(info.exec_command)
-                if exec_path.exists() and exec_path.parent == self.appimage_storage:
-                    exec_path.unlink()
+                exec_command = data.get('exec_command')
+                if exec_command:
+                    exec_path = Path(exec_command)
+                    if exec_path.exists() and exec_path.parent == self.appimage_storage:
+                        exec_path.unlink()
+                return True
             
-            # Unregister from registry
-            return self.unregister_appimage(appimage_path)
+            # Look up, delete and unregister with one registry load and save
+            return self._mutate_registry(remove_entry)
             
         except Exception as e:
             print(f"Error uninstalling AppImage: {e}")
@@ -832,14 +1407,13 @@ class AppImageManager:
             bool: True if unregistration successful, False otherwise.
         """
         try:
-            registry = self._load_registry()
-            abs_path = str(Path(appimage_path).absolute())
+            abs_path = self._get_registry_key(appimage_path)
             
-            if abs_path in registry:
-                del registry[abs_path]
-                return self._save_registry(registry)
+            def remove_entry(registry: Dict) -> bool:
+                # Nothing to save if already not registered
+                return registry.pop(abs_path, None) is not None
             
-            return True  # Already not registered
+            return self._mutate_registry(remove_entry)
             
         except Exception as e:
             print(f"Error unregistering AppImage: {e}")
@@ -855,31 +1429,114 @@ class AppImageManager:
         Returns:
             Optional[AppImageInfo]: Registered information or None.
         """
-        registry = self._load_registry()
-        abs_path = str(Path(appimage_path).absolute())
+        registry = self._get_cached_registry()
+        abs_path = self._get_registry_key(appimage_path)
         
         if abs_path in registry:
             data = registry[abs_path]
-            return AppImageInfo(**data)
+            return AppImageInfo.from_dict(data)
         
         return None
     
+    def _mutate_registry(self, mutate: Callable[[Dict], bool]) -> bool:
+        """
+        Load the registry once, apply a change and save it once if needed.
+        
+        Args:
+            mutate (Callable[[Dict], bool]): Modifies the registry in place and
+                returns True if anything changed.
+            
+        Returns:
+            bool: True if the registry is up to date, False if saving failed.
+        """
+        registry = self._load_registry()
+        if not mutate(registry):
+            return True
+        return self._save_registry(registry)
+    
     def _load_registry(self) -> Dict:
         """
         Load the AppImage registry from file.
         
+        The parsed registry is cached in memory and only re-read when the
+        file's modification time or size changes.
+        
+        Returns:
+            Dict: Registry data.
+        """
+        # Shallow copy so callers can add/remove entries without
+        # touching the cache before the registry is saved
+        return dict(self._get_cached_registry())
+    
+    def _get_cached_registry(self) -> Dict:
+        """
+        Get the cached registry, re-reading the file only if it changed.
+        
+        The returned dict is shared with the cache and must not be modified;
+        use _load_registry() for a copy that can be changed and saved.
+        
         Returns:
             Dict: Registry data.
         """
         try:
-            if self.registry_file.exists():
-                with open(self.registry_file, 'r') as f:
-                    return json.load(f)
+            stamp = self._get_registry_stamp()
+            if stamp is None:
+                self._invalidate_registry_cache()
+                return {}
+            
+            if stamp != self._registry_stamp or self._registry_cache is None:
+                with open(self.registry_file, 'rb') as f:
+                    self._registry_cache = _loads_registry(f.read())
+                self._registry_stamp = stamp
+                self._name_index = None
+            
+            return self._registry_cache
         except Exception:
-            pass
+            self._invalidate_registry_cache()
         
         return {}
     
+    def _invalidate_registry_cache(self) -> None:
+        """Drop the cached registry and everything derived from it."""
+        self._registry_cache = None
+        self._registry_stamp = None
+        self._name_index = None
+    
+    def _get_name_index(self) -> Dict[str, List[str]]:
+        """
+        Get the index of normalized application names to registry keys.
+        
+        Returns:
+            Dict[str, List[str]]: Normalized name to list of registry keys.
+        """
+        registry = self._get_cached_registry()
+        
+        if self._name_index is None:
+            name_index = {}
+            for path, data in registry.items():
+                try:
+                    normalized = self._normalize_app_name(data['name'])
+                except Exception:
+                    continue
+                if normalized:
+                    name_index.setdefault(normalized, []).append(path)
+            self._name_index = name_index
+        
+        return self._name_index
+    
+    def _get_registry_stamp(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the modification stamp of the registry file.
+        
+        Returns:
+            Optional[Tuple[int, int]]: (mtime in ns, size) or None if the file is missing.
+        """
+        try:
+            st = self.registry_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
     def _save_registry(self, registry: Dict) -> bool:
         """
         Save the AppImage registry to file.
@@ -890,14 +1547,40 @@ class AppImageManager:
         Returns:
             bool: True if save successful, False otherwise.
         """
+        temp_name = None
         try:
+            import tempfile
+            
             self.registry_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.registry_file, 'w') as f:
-                json.dump(registry, f, indent=2)
+            payload = _dumps_registry(registry)
+            
+            # Write to a temporary file and atomically swap it in, so a crash
+            # or concurrent writer can never leave a truncated registry behind
+            with tempfile.NamedTemporaryFile('wb', dir=self.registry_file.parent,
+                                             prefix='.registry-', suffix='.tmp',
+                                             delete=False) as f:
+                temp_name = f.name
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.registry_file)
+            temp_name = None
+            
+            # Keep the cache in sync so the next load is a no-op
+            self._registry_cache = dict(registry)
+            self._registry_stamp = self._get_registry_stamp()
+            self._name_index = None
             return True
         except Exception as e:
             print(f"Error saving registry: {e}")
+            self._invalidate_registry_cache()
             return False
+        finally:
+            if temp_name:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
 
     def find_installed_version(self, new_info: AppImageInfo) -> Optional[AppImageInfo]:
         """
@@ -909,22 +1592,32 @@ class AppImageManager:
         Returns:
             Optional[AppImageInfo]: Information about installed version, or None if not found.
         """
-        registry = self._load_registry()
+        registry = self._get_cached_registry()
+        name_index = self._get_name_index()
         
         # Normalize the new app name for comparison
         new_name_normalized = self._normalize_app_name(new_info.name)
+        if not new_name_normalized:
+            return None
         
-        for path, data in registry.items():
+        # Exact name matches are a single index probe
+        for path in name_index.get(new_name_normalized, ()):
             try:
-                installed_info = AppImageInfo(**data)
-                installed_name_normalized = self._normalize_app_name(installed_info.name)
-                
-                # Check if it's the same application by name similarity
-                if self._are_same_application(new_name_normalized, installed_name_normalized):
-                    return installed_info
-                    
+                return AppImageInfo.from_dict(registry[path])
             except Exception:
                 continue
+        
+        # Otherwise scan the cached normalized names for ones that contain one another
+        for installed_name_normalized, paths in name_index.items():
+            if installed_name_normalized == new_name_normalized:
+                continue
+            if not self._are_same_application(new_name_normalized, installed_name_normalized):
+                continue
+            for path in paths:
+                try:
+                    return AppImageInfo.from_dict(registry[path])
+                except Exception:
+                    continue
                 
         return None
 
@@ -938,18 +1631,7 @@ class AppImageManager:
         Returns:
             str: Normalized name for comparison.
         """
-        # Convert to lowercase and remove common suffixes/prefixes
-        normalized = name.lower().strip()
-        
-        # Remove version numbers, architecture info, and common suffixes
-        normalized = re.sub(r'[-_\s]*v?\d+\.\d+(\.\d+)?[-_\s]*', '', normalized)
-        normalized = re.sub(r'[-_\s]*(x86_64|amd64|i386|arm64|aarch64)[-_\s]*', '', normalized)
-        normalized = re.sub(r'[-_\s]*(appimage|portable|linux)[-_\s]*', '', normalized)
-        
-        # Remove extra spaces and normalize separators
-        normalized = re.sub(r'[-_\s]+', ' ', normalized).strip()
-        
-        return normalized
+        return _normalize_app_name(name)
 
     def _are_same_application(self, name1: str, name2: str) -> bool:
         """
@@ -969,8 +1651,10 @@ class AppImageManager:
         if name1 == name2:
             return True
             
-        # Check if one is a substring of the other (for different naming conventions)
-        return name1 in name2 or name2 in name1
+        # Check if one is a substring of the other (for different naming
+        # conventions); only the shorter name can be, so scan just once
+        shorter, longer = (name1, name2) if len(name1) <= len(name2) else (name2, name1)
+        return shorter in longer
 
     def compare_versions(self, version1: str, version2: str) -> int:
         """
@@ -988,7 +1672,13 @@ class AppImageManager:
         if not version2 or version2 == 'Unknown':
             return 1
             
-        # Try semantic version comparison
+        # Prefer full version semantics (pre-releases, post-releases, epochs)
+        pep440_v1 = _parse_pep440_version(version1)
+        pep440_v2 = _parse_pep440_version(version2)
+        if pep440_v1 is not None and pep440_v2 is not None:
+            return (pep440_v1 > pep440_v2) - (pep440_v1 < pep440_v2)
+        
+        # Try numeric component comparison
         try:
             v1_parts = self._parse_version(version1)
             v2_parts = self._parse_version(version2)
@@ -1025,7 +1715,7 @@ class AppImageManager:
             List[int]: List of numeric version components.
         """
         # Extract numeric parts from version string
-        parts = re.findall(r'\d+', version)
+        parts = _VERSION_PART_RE.findall(version)
         return [int(part) for part in parts]
 
     def is_newer_version(self, new_version: str, installed_version: str) -> bool:
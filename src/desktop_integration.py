@@ -6,11 +6,113 @@ and system integration for AppImage files.
 """
 
 import os
+import re
+import shutil
 import subprocess
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from .appimage_manager import AppImageInfo
 
+# Runs of characters not allowed in desktop filenames, underscores included so
+# that a run collapses to a single underscore
+_UNSAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9.-]+')
+
+# Desktop entries for AppImage Installer itself: the main entry (GUI manager)
+# and the hidden file handler entry (file associations)
+_INSTALLER_DESKTOP_ENTRY = """[Desktop Entry]
+Version=1.0
+Type=Application
+Name=AppImage Installer
+Comment=Manage and install AppImage applications with ease
+Exec=appimage-installer --manage
+Icon=appimage-installer
+Categories=System;Settings;PackageManager;
+Terminal=false
+StartupNotify=true
+StartupWMClass=AppImage Installer
+Keywords=appimage;install;package;application;manager;
+"""
+
+_INSTALLER_HANDLER_DESKTOP_ENTRY = """[Desktop Entry]
+Version=1.0
+Type=Application
+Name=AppImage Installer (File Handler)
+Comment=Handle AppImage files for installation
+Exec=appimage-installer %f
+Icon=appimage-installer
+Categories=System;
+Terminal=false
+StartupNotify=true
+NoDisplay=true
+MimeType=application/x-appimage;application/vnd.appimage;
+"""
+
+
+@lru_cache(maxsize=256)
+def _sanitize_filename(name: str) -> str:
+    """
+    Sanitize a name for use as filename.
+    
+    Cached because the launcher entry, the Desktop shortcut and their
+    removal all sanitize the same application name.
+    
+    Args:
+        name (str): Original name.
+        
+    Returns:
+        str: Sanitized filename.
+    """
+    # Replace invalid characters and spaces, collapsing runs of underscores
+    return _UNSAFE_FILENAME_RE.sub("_", name).strip("_")
+
+
+def _write_desktop_entry(path: Path, content: str) -> None:
+    """
+    Write an executable .desktop file, replacing any existing one atomically.
+    
+    The file is created with its final mode and swapped into place, so
+    desktop environments watching the directory never see a partial entry.
+    
+    Args:
+        path (Path): Destination .desktop file.
+        content (str): Desktop entry content.
+    """
+    import tempfile
+    
+    # A unique temp file per writer, so concurrent writers of the same entry
+    # never truncate each other's file before it is renamed into place
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            os.fchmod(f.fileno(), 0o755)
+            f.write(content)
+        os.replace(temp_name, path)
+    except Exception:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _reap_child(pid: int) -> None:
+    """
+    Wait for a launched process in a daemon thread so it never lingers as a zombie.
+    
+    Args:
+        pid (int): Process id returned by os.posix_spawn.
+    """
+    def wait():
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    
+    threading.Thread(target=wait, name=f"reap-{pid}", daemon=True).start()
+
 
 class DesktopIntegration:
     """
@@ -27,6 +129,14 @@ class DesktopIntegration:
         self.applications_dir = self.data_dir / "applications"
         self.desktop_dir = self.home_dir / "Desktop"
         
+        # Desktop database updates are deferred while inside batched()
+        self._batch_depth = 0
+        self._database_update_pending = False
+        
+        # Path to update-desktop-database, looked up on first use
+        self._update_db_bin: Optional[str] = None
+        self._update_db_bin_resolved = False
+        
         # Ensure directories exist
         self.applications_dir.mkdir(parents=True, exist_ok=True)
     
@@ -57,11 +167,7 @@ class DesktopIntegration:
             desktop_content = self._generate_desktop_content(info)
             
             # Write desktop file
-            with open(desktop_path, 'w', encoding='utf-8') as f:
-                f.write(desktop_content)
-            
-            # Make executable
-            os.chmod(desktop_path, 0o755)
+            _write_desktop_entry(desktop_path, desktop_content)
             
             # Update desktop database
             self._update_desktop_database()
@@ -116,15 +222,22 @@ class DesktopIntegration:
             shortcut_filename = f"{safe_name}.desktop"
             shortcut_path = self.desktop_dir / shortcut_filename
             
-            # Create desktop file content
-            desktop_content = self._generate_desktop_content(info)
+            # Reuse the launcher entry written by create_desktop_file when
+            # there is one, rather than rebuilding it
+            desktop_content = None
+            if info.desktop_file_path:
+                try:
+                    with open(info.desktop_file_path, encoding='utf-8') as f:
+                        desktop_content = f.read()
+                except OSError:
+                    pass
             
-            # Write shortcut file
-            with open(shortcut_path, 'w', encoding='utf-8') as f:
-                f.write(desktop_content)
+            # Otherwise create desktop file content
+            if desktop_content is None:
+                desktop_content = self._generate_desktop_content(info)
             
-            # Make executable
-            os.chmod(shortcut_path, 0o755)
+            # Write shortcut file
+            _write_desktop_entry(shortcut_path, desktop_content)
             
             return True
             
@@ -169,15 +282,7 @@ class DesktopIntegration:
         Returns:
             str: Sanitized filename.
         """
-        # Remove invalid characters and replace spaces
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-"
-        sanitized = "".join(c if c in safe_chars else "_" for c in name)
-        
-        # Remove multiple underscores and trim
-        while "__" in sanitized:
-            sanitized = sanitized.replace("__", "_")
-        
-        return sanitized.strip("_")
+        return _sanitize_filename(name)
     
     def _generate_desktop_content(self, info: AppImageInfo) -> str:
         """
@@ -189,47 +294,70 @@ class DesktopIntegration:
         Returns:
             str: Desktop file content.
         """
-        # Build categories string
-        categories = ";".join(info.categories) if info.categories else "Application"
-        if not categories.endswith(";"):
-            categories += ";"
-        
-        # Build MIME types string
-        mime_types = ";".join(info.mime_types) if info.mime_types else ""
-        if mime_types and not mime_types.endswith(";"):
-            mime_types += ";"
+        # Build semicolon-terminated categories and MIME types strings
+        categories = ";".join(info.categories or ("Application",)) + ";"
+        mime_types = ";".join(info.mime_types) + ";" if info.mime_types else ""
         
-        # Generate desktop content
-        content = f"""[Desktop Entry]
-Version=1.0
-Type=Application
-Name={info.name}
-Comment={info.description}
-Exec={info.exec_command}
-Icon={info.icon_path if info.icon_path else 'application-x-executable'}
-Categories={categories}
-Terminal=false
-StartupNotify=true
-StartupWMClass={info.name}
-"""
+        # Generate desktop content as lines joined once at the end
+        lines = [
+            "[Desktop Entry]",
+            "Version=1.0",
+            "Type=Application",
+            f"Name={info.name}",
+            f"Comment={info.description}",
+            f"Exec={info.exec_command}",
+            f"Icon={info.icon_path if info.icon_path else 'application-x-executable'}",
+            f"Categories={categories}",
+            "Terminal=false",
+            "StartupNotify=true",
+            f"StartupWMClass={info.name}"
+        ]
         
         if mime_types:
-            content += f"MimeType={mime_types}\n"
+            lines.append(f"MimeType={mime_types}")
         
         if info.version and info.version != 'Unknown':
-            content += f"X-AppImage-Version={info.version}\n"
+            lines.append(f"X-AppImage-Version={info.version}")
         
-        content += f"X-AppImage-Path={info.appimage_path}\n"
-        content += "X-AppImage-Installer=true\n"
+        lines.append(f"X-AppImage-Path={info.appimage_path}")
+        lines.append("X-AppImage-Installer=true")
         
-        return content
+        return "\n".join(lines) + "\n"
+    
+    @contextmanager
+    def batched(self) -> Iterator[None]:
+        """
+        Defer desktop database updates until the end of a group of changes.
+        
+        update-desktop-database runs at most once when the outermost batch
+        exits, however many desktop files were created or removed inside it.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._database_update_pending:
+                self._database_update_pending = False
+                self._update_desktop_database()
     
     def _update_desktop_database(self) -> None:
         """Update the desktop database to refresh application cache."""
+        if self._batch_depth:
+            self._database_update_pending = True
+            return
+        
+        # Skip spawning a process when the tool is not installed
+        if not self._update_db_bin_resolved:
+            self._update_db_bin = shutil.which('update-desktop-database')
+            self._update_db_bin_resolved = True
+        if not self._update_db_bin:
+            return
+        
         try:
             # Try to update desktop database
             subprocess.run([
-                'update-desktop-database', str(self.applications_dir)
+                self._update_db_bin, str(self.applications_dir)
             ], capture_output=True, timeout=10)
         except Exception:
             # Silent fail - not critical
@@ -257,10 +385,18 @@ StartupWMClass={info.name}
                 print(f"AppImage file is not executable: {appimage_path}")
                 return False
             
-            # Launch AppImage in background
-            subprocess.Popen([str(path)], 
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL)
+            # Launch AppImage in background, spawning directly where supported
+            if hasattr(os, 'posix_spawn'):
+                pid = os.posix_spawn(str(path), [str(path)], os.environ, file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0)
+                ])
+                # Nothing else waits on the child, so reap it once it exits
+                _reap_child(pid)
+            else:
+                subprocess.Popen([str(path)], 
+                               stdout=subprocess.DEVNULL, 
+                               stderr=subprocess.DEVNULL)
             
             return True
             
@@ -268,56 +404,30 @@ StartupWMClass={info.name}
             print(f"Error launching AppImage: {e}")
             return False
     
-    def create_appimage_installer_desktop_files(self) -> bool:
+    def create_appimage_installer_desktop_files(self, update_database: bool = True) -> bool:
         """
         Create desktop files for AppImage Installer application itself.
         
+        Args:
+            update_database (bool): Whether to refresh the desktop database
+                afterwards. Callers that run update-desktop-database
+                themselves pass False to avoid a second scan.
+            
         Returns:
             bool: True if creation successful, False otherwise.
         """
         try:
             # Create main AppImage Installer desktop entry (for GUI manager)
-            main_desktop_content = """[Desktop Entry]
-Version=1.0
-Type=Application
-Name=AppImage Installer
-Comment=Manage and install AppImage applications with ease
-Exec=appimage-installer --manage
-Icon=appimage-installer
-Categories=System;Settings;PackageManager;
-Terminal=false
-StartupNotify=true
-StartupWMClass=AppImage Installer
-Keywords=appimage;install;package;application;manager;
-"""
-            
             main_desktop_path = self.applications_dir / "appimage-installer.desktop"
-            with open(main_desktop_path, 'w', encoding='utf-8') as f:
-                f.write(main_desktop_content)
-            os.chmod(main_desktop_path, 0o755)
+            _write_desktop_entry(main_desktop_path, _INSTALLER_DESKTOP_ENTRY)
             
             # Create hidden file handler desktop entry (for file associations)
-            handler_desktop_content = """[Desktop Entry]
-Version=1.0
-Type=Application
-Name=AppImage Installer (File Handler)
-Comment=Handle AppImage files for installation
-Exec=appimage-installer %f
-Icon=appimage-installer
-Categories=System;
-Terminal=false
-StartupNotify=true
-NoDisplay=true
-MimeType=application/x-appimage;application/vnd.appimage;
-"""
-            
             handler_desktop_path = self.applications_dir / "appimage-installer-handler.desktop"
-            with open(handler_desktop_path, 'w', encoding='utf-8') as f:
-                f.write(handler_desktop_content)
-            os.chmod(handler_desktop_path, 0o755)
+            _write_desktop_entry(handler_desktop_path, _INSTALLER_HANDLER_DESKTOP_ENTRY)
             
             # Update desktop database
-            self._update_desktop_database()
+            if update_database:
+                self._update_desktop_database()
             
             return True
             
@@ -325,10 +435,34 @@ MimeType=application/x-appimage;application/vnd.appimage;
             print(f"Error creating AppImage Installer desktop files: {e}")
             return False
     
-    def remove_appimage_installer_desktop_files(self) -> bool:
+    def appimage_installer_desktop_files_current(self) -> bool:
+        """
+        Check whether the AppImage Installer desktop files are up to date.
+        
+        Returns:
+            bool: True if both files exist with the content that
+            create_appimage_installer_desktop_files would write.
+        """
+        try:
+            for filename, content in (
+                ("appimage-installer.desktop", _INSTALLER_DESKTOP_ENTRY),
+                ("appimage-installer-handler.desktop", _INSTALLER_HANDLER_DESKTOP_ENTRY),
+            ):
+                with open(self.applications_dir / filename, 'rb') as f:
+                    if f.read() != content.encode('utf-8'):
+                        return False
+            return True
+        except OSError:
+            return False
+    
+    def remove_appimage_installer_desktop_files(self, update_database: bool = True) -> bool:
         """
         Remove AppImage Installer desktop files.
         
+        Args:
+            update_database (bool): Whether to refresh the desktop database
+                afterwards.
+            
         Returns:
             bool: True if removal successful, False otherwise.
         """
@@ -344,7 +478,8 @@ MimeType=application/x-appimage;application/vnd.appimage;
                 handler_desktop_path.unlink()
             
             # Update desktop database
-            self._update_desktop_database()
+            if update_database:
+                self._update_desktop_database()
             
             return True
             
@@ -11,6 +11,88 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
+# MIME type definition for .AppImage files, installed per user and system-wide
+_MIME_XML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">
+    <mime-type type="application/x-appimage">
+        <comment>AppImage application bundle</comment>
+        <comment xml:lang="en">AppImage application bundle</comment>
+        <icon name="appimage-installer"/>
+        <glob pattern="*.AppImage" weight="95"/>
+        <glob pattern="*.appimage" weight="95"/>
+        <magic priority="90">
+            <match type="string" offset="0:102400" value="AppImage"/>
+        </magic>
+        <magic priority="85">
+            <match type="string" offset="0:102400" value="appimage"/>
+        </magic>
+    </mime-type>
+</mime-info>'''
+
+# Desktop entry that handles opened AppImages, and the MIME types it is made
+# the default application for (AppImages first, then conflicting types)
+_HANDLER_DESKTOP_FILE = 'appimage-installer-handler.desktop'
+_DEFAULT_MIME_TYPES = (
+    'application/x-appimage',
+    'application/x-executable',
+    'application/x-sharedlib',
+    'application/octet-stream',
+)
+
+
+def _with_default_applications(text: str) -> str:
+    """
+    Make the handler the default application for our MIME types in mimeapps.list text.
+    
+    The file is edited line by line, so comments, other sections and the
+    order of existing entries are kept exactly as they were.
+    
+    Args:
+        text (str): Current mimeapps.list content (may be empty).
+        
+    Returns:
+        str: Updated mimeapps.list content.
+    """
+    default_line = '{}=' + _HANDLER_DESKTOP_FILE + '\n'
+    missing = list(_DEFAULT_MIME_TYPES)
+    lines = []
+    in_defaults = False
+    insert_at = None
+    
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith('['):
+            # Missing entries go at the end of the first defaults section
+            if in_defaults and insert_at is None:
+                insert_at = len(lines)
+            in_defaults = stripped == '[Default Applications]'
+        elif in_defaults and '=' in stripped and not stripped.startswith('#'):
+            key = stripped.split('=', 1)[0].strip()
+            if key in _DEFAULT_MIME_TYPES:
+                if key in missing:
+                    missing.remove(key)
+                line = default_line.format(key)
+        lines.append(line)
+    
+    if in_defaults and insert_at is None:
+        insert_at = len(lines)
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    
+    new_lines = [default_line.format(mime_type) for mime_type in missing]
+    if insert_at is None:
+        if lines and lines[-1].strip():
+            lines.append('\n')
+        lines.append('[Default Applications]\n')
+        lines.extend(new_lines)
+    else:
+        # Keep blank lines that separate the section from the next one
+        while insert_at > 0 and not lines[insert_at - 1].strip():
+            insert_at -= 1
+        lines[insert_at:insert_at] = new_lines
+
+    return ''.join(lines)
+
 
 class FileAssociation:
     """
@@ -22,22 +104,31 @@ class FileAssociation:
     
     def __init__(self):
         """Initialize file association manager."""
-        self.home_dir = Path.home()
+        # Paths are kept as plain strings; they only feed os calls and argv
+        self.home_dir = os.path.expanduser("~")
         self.data_dir = self._get_data_dir()
-        self.applications_dir = self.data_dir / "applications"
-        self.mime_dir = self.data_dir / "mime"
-        self.packages_dir = self.mime_dir / "packages"
+        self.applications_dir = os.path.join(self.data_dir, "applications")
+        self.mime_dir = os.path.join(self.data_dir, "mime")
+        self.packages_dir = os.path.join(self.mime_dir, "packages")
+        self._mime_file = os.path.join(self.packages_dir, "appimage-installer.xml")
+        
+        # Files that must all exist for the association to count as registered
+        self._registration_files = (
+            self._mime_file,
+            os.path.join(self.applications_dir, "appimage-installer.desktop"),
+            os.path.join(self.applications_dir, "appimage-installer-handler.desktop"),
+        )
         
-        # Ensure directories exist
-        self.applications_dir.mkdir(parents=True, exist_ok=True)
-        self.packages_dir.mkdir(parents=True, exist_ok=True)
+        # Path to the main script, looked up on first use
+        self._script_path: Optional[str] = None
+        self._script_path_resolved = False
     
-    def _get_data_dir(self) -> Path:
+    def _get_data_dir(self) -> str:
         """Get XDG data directory."""
         xdg_data = os.environ.get('XDG_DATA_HOME')
         if xdg_data:
-            return Path(xdg_data)
-        return self.home_dir / ".local" / "share"
+            return xdg_data
+        return os.path.join(self.home_dir, ".local", "share")
     
     def register(self) -> bool:
         """
@@ -47,35 +138,37 @@ class FileAssociation:
             bool: True if registration successful, False otherwise.
         """
         try:
-            # Create MIME type definition
-            if not self._create_mime_type():
-                return False
-            
-            # Create desktop application entries using DesktopIntegration
             from .desktop_integration import DesktopIntegration
             desktop_integration = DesktopIntegration()
-            if not desktop_integration.create_appimage_installer_desktop_files():
-                return False
             
-            # Update MIME database
-            if not self._update_mime_database():
-                return False
+            # Re-registering unchanged files only needs the defaults restored;
+            # the expensive database updates already ran for these files
+            if self._registration_is_current(desktop_integration):
+                self._set_default_applications()
+                return True
             
-            # Update desktop database
-            if not self._update_desktop_database():
+            # Create MIME type definition
+            if not self._create_mime_type():
                 return False
             
-            # Set as default application for AppImage MIME type
-            self._set_default_application()
-            
-            # Also set as default for executable types that might conflict
-            self._set_additional_defaults()
-            
-            # Force system-wide desktop database update
-            self._update_system_desktop_database()
+            # Create desktop application entries using DesktopIntegration
+            if not desktop_integration.create_appimage_installer_desktop_files(update_database=False):
+                return False
             
-            # Try to register system-wide MIME type as well
-            self._register_system_mime_type()
+            # The two database updates are independent of each other, so run
+            # them side by side and wait only as long as the slower one
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                mime_update = executor.submit(self._update_mime_database)
+                desktop_update = executor.submit(self._update_desktop_database)
+                
+                if not (mime_update.result() and desktop_update.result()):
+                    return False
+                
+                # Only claim the MIME types once they are actually registered
+                defaults_update = executor.submit(self._set_default_applications)
+                self._register_system_mime_type()
+                defaults_update.result()
             
             return True
             
@@ -92,14 +185,13 @@ class FileAssociation:
         """
         try:
             # Remove MIME type definition
-            mime_file = self.packages_dir / "appimage-installer.xml"
-            if mime_file.exists():
-                mime_file.unlink()
+            if os.path.exists(self._mime_file):
+                os.unlink(self._mime_file)
             
             # Remove desktop application entries using DesktopIntegration
             from .desktop_integration import DesktopIntegration
             desktop_integration = DesktopIntegration()
-            desktop_integration.remove_appimage_installer_desktop_files()
+            desktop_integration.remove_appimage_installer_desktop_files(update_database=False)
             
             # Update databases
             self._update_mime_database()
@@ -118,11 +210,36 @@ class FileAssociation:
         Returns:
             bool: True if registered, False otherwise.
         """
-        mime_file = self.packages_dir / "appimage-installer.xml"
-        app_file = self.applications_dir / "appimage-installer.desktop"
-        handler_file = self.applications_dir / "appimage-installer-handler.desktop"
+        return all(map(os.path.exists, self._registration_files))
+    
+    def _registration_is_current(self, desktop_integration) -> bool:
+        """
+        Check whether the registration files are unchanged and already indexed.
         
-        return mime_file.exists() and app_file.exists() and handler_file.exists()
+        Args:
+            desktop_integration (DesktopIntegration): Desktop integration
+                that owns the installer's desktop entries.
+            
+        Returns:
+            bool: True if the MIME definition and desktop entries match what
+            register() would write and both databases were rebuilt since.
+        """
+        mime_file, _, handler_file = self._registration_files
+        try:
+            with open(mime_file, 'rb') as f:
+                if f.read() != _MIME_XML:
+                    return False
+            if not desktop_integration.appimage_installer_desktop_files_current():
+                return False
+            
+            # The caches written by the database updates must be newer than
+            # the files, otherwise an earlier update may have failed
+            mime_cache = os.path.join(self.mime_dir, "mime.cache")
+            desktop_cache = os.path.join(self.applications_dir, "mimeinfo.cache")
+            return (os.path.getmtime(mime_cache) >= os.path.getmtime(mime_file) and
+                    os.path.getmtime(desktop_cache) >= os.path.getmtime(handler_file))
+        except OSError:
+            return False
     
     def _create_mime_type(self) -> bool:
         """
@@ -132,26 +249,15 @@ class FileAssociation:
             bool: True if creation successful, False otherwise.
         """
         try:
-            mime_xml = '''<?xml version="1.0" encoding="UTF-8"?>
-<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">
-    <mime-type type="application/x-appimage">
-        <comment>AppImage application bundle</comment>
-        <comment xml:lang="en">AppImage application bundle</comment>
-        <icon name="appimage-installer"/>
-        <glob pattern="*.AppImage" weight="95"/>
-        <glob pattern="*.appimage" weight="95"/>
-        <magic priority="90">
-            <match type="string" offset="0:102400" value="AppImage"/>
-        </magic>
-        <magic priority="85">
-            <match type="string" offset="0:102400" value="appimage"/>
-        </magic>
-    </mime-type>
-</mime-info>'''
+            # Directories are only needed once something is written; the
+            # applications directory is created by DesktopIntegration
+            os.makedirs(self.packages_dir, exist_ok=True)
             
-            mime_file = self.packages_dir / "appimage-installer.xml"
-            with open(mime_file, 'w', encoding='utf-8') as f:
-                f.write(mime_xml)
+            fd = os.open(self._mime_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, _MIME_XML)
+            finally:
+                os.close(fd)
             
             return True
             
@@ -159,12 +265,22 @@ class FileAssociation:
             print(f"Error creating MIME type: {e}")
             return False
     
-
-    
     def _get_script_path(self) -> Optional[str]:
         """
         Get the path to the main script executable.
         
+        Returns:
+            Optional[str]: Path to script or None if not found.
+        """
+        if not self._script_path_resolved:
+            self._script_path = self._find_script_path()
+            self._script_path_resolved = True
+        return self._script_path
+    
+    def _find_script_path(self) -> Optional[str]:
+        """
+        Search PATH and the source tree for the main script executable.
+        
         Returns:
             Optional[str]: Path to script or None if not found.
         """
@@ -197,7 +313,7 @@ class FileAssociation:
         try:
             # Try to update MIME database
             result = subprocess.run([
-                'update-mime-database', str(self.mime_dir)
+                'update-mime-database', self.mime_dir
             ], capture_output=True, timeout=30)
             
             return result.returncode == 0
@@ -206,63 +322,78 @@ class FileAssociation:
             # Silent fail - not critical
             return True
     
-    def _set_default_application(self) -> bool:
+    def _set_default_applications(self) -> bool:
         """
-        Explicitly set our application as the default for AppImage MIME type.
+        Set our application as default for AppImages and conflicting MIME types.
+        
+        All defaults are written to the user's mimeapps.list in one pass,
+        which is where xdg-mime stores them, instead of running xdg-mime
+        once per MIME type. Everything else in the file is left untouched.
         
         Returns:
             bool: True if successful, False otherwise.
         """
+        import configparser
+        import tempfile
+        
+        temp_name = None
         try:
-            result = subprocess.run([
-                'xdg-mime', 'default', 'appimage-installer-handler.desktop', 'application/x-appimage'
-            ], capture_output=True, timeout=30)
+            config_dir = os.environ.get('XDG_CONFIG_HOME') or os.path.join(self.home_dir, '.config')
+            mimeapps_file = os.path.join(config_dir, 'mimeapps.list')
             
-            return result.returncode == 0
+            try:
+                with open(mimeapps_file, encoding='utf-8') as f:
+                    text = f.read()
+            except FileNotFoundError:
+                text = ''
             
-        except Exception:
-            return False
-    
-    def _update_system_desktop_database(self) -> bool:
-        """
-        Update system-wide desktop database.
-        
-        Returns:
-            bool: True if successful, False otherwise.
-        """
-        try:
-            # Try system-wide update (requires sudo, may fail)
-            subprocess.run([
-                'sudo', 'update-desktop-database'
-            ], capture_output=True, timeout=30)
+            # Only edit files that parse as a desktop-style ini file
+            parser = configparser.RawConfigParser(delimiters=('=',), strict=False)
+            parser.read_string(text)
+            
+            # Write to a temporary file and atomically swap it in
+            os.makedirs(config_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=config_dir,
+                                             prefix='.mimeapps-', suffix='.tmp',
+                                             delete=False) as f:
+                temp_name = f.name
+                f.write(_with_default_applications(text))
+                os.fchmod(f.fileno(), 0o644)
+            os.replace(temp_name, mimeapps_file)
+            temp_name = None
             
             return True
             
+        except (configparser.Error, UnicodeDecodeError):
+            # Leave files we cannot parse to xdg-mime itself
+            return self._set_defaults_with_xdg_mime()
         except Exception:
-            return True  # Don't fail if we can't do system update
+            return False
+        finally:
+            if temp_name:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
     
-    def _set_additional_defaults(self) -> bool:
+    def _set_defaults_with_xdg_mime(self) -> bool:
         """
-        Set our application as default for additional MIME types that might conflict.
+        Set our application as default for each MIME type through xdg-mime.
         
         Returns:
             bool: True if successful, False otherwise.
         """
-        additional_types = [
-            'application/x-executable',
-            'application/x-sharedlib',
-            'application/octet-stream'
-        ]
-        
-        for mime_type in additional_types:
+        success = True
+        for mime_type in _DEFAULT_MIME_TYPES:
             try:
-                subprocess.run([
-                    'xdg-mime', 'default', 'appimage-installer-handler.desktop', mime_type
+                result = subprocess.run([
+                    'xdg-mime', 'default', _HANDLER_DESKTOP_FILE, mime_type
                 ], capture_output=True, timeout=30)
+                success = success and result.returncode == 0
             except Exception:
-                pass  # Don't fail if one doesn't work
-                
-        return True
+                success = False  # Don't stop if one doesn't work
+        
+        return success
     
     def _register_system_mime_type(self) -> bool:
         """
@@ -272,45 +403,16 @@ class FileAssociation:
             bool: True if successful, False otherwise.
         """
         try:
-            # Create temporary MIME file
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.xml', delete=False) as f:
-                f.write('''<?xml version="1.0" encoding="UTF-8"?>
-<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">
-    <mime-type type="application/x-appimage">
-        <comment>AppImage application bundle</comment>
-        <comment xml:lang="en">AppImage application bundle</comment>
-        <icon name="appimage-installer"/>
-        <glob pattern="*.AppImage" weight="95"/>
-        <glob pattern="*.appimage" weight="95"/>
-        <magic priority="90">
-            <match type="string" offset="0:102400" value="AppImage"/>
-        </magic>
-        <magic priority="85">
-            <match type="string" offset="0:102400" value="appimage"/>
-        </magic>
-        <sub-class-of type="application/x-executable"/>
-    </mime-type>
-</mime-info>''')
-                temp_file = f.name
-            
-            # Try to install system-wide
+            # Try to install system-wide, piping the definition straight in
             result = subprocess.run([
-                'sudo', 'cp', temp_file, '/usr/share/mime/packages/appimage-installer.xml'
-            ], capture_output=True, timeout=30)
+                'sudo', 'tee', '/usr/share/mime/packages/appimage-installer.xml'
+            ], input=_MIME_XML, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
             
             if result.returncode == 0:
                 # Update system MIME database
                 subprocess.run([
                     'sudo', 'update-mime-database', '/usr/share/mime'
                 ], capture_output=True, timeout=30)
-            
-            # Clean up temp file
-            import os
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
                 
             return True
             
@@ -327,7 +429,7 @@ class FileAssociation:
         try:
             # Try to update desktop database
             result = subprocess.run([
-                'update-desktop-database', str(self.applications_dir)
+                'update-desktop-database', self.applications_dir
             ], capture_output=True, timeout=30)
             
             return result.returncode == 0
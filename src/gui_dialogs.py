@@ -9,6 +9,7 @@ import os
 import sys
 from typing import Optional, Tuple
 from enum import Enum
+from functools import lru_cache, partial
 
 
 class DialogType(Enum):
@@ -27,6 +28,37 @@ class DialogResult(Enum):
     CANCEL = "cancel"
 
 
+# GTK module imported by the first GTK dialog (False if it could not be
+# loaded), and the message and button types used for each dialog type
+_GTK = None
+_GTK_DIALOG_STYLES = None
+
+
+def _get_gtk():
+    """
+    Import GTK 3 once per process.
+    
+    Returns:
+        The Gtk module, or None if GTK cannot be loaded.
+    """
+    global _GTK, _GTK_DIALOG_STYLES
+    if _GTK is None:
+        try:
+            import gi
+            gi.require_version('Gtk', '3.0')
+            from gi.repository import Gtk
+        except (ImportError, ValueError):
+            _GTK = False
+        else:
+            _GTK_DIALOG_STYLES = {
+                DialogType.INFO: (Gtk.MessageType.INFO, Gtk.ButtonsType.OK),
+                DialogType.QUESTION: (Gtk.MessageType.QUESTION, Gtk.ButtonsType.YES_NO),
+                DialogType.ERROR: (Gtk.MessageType.ERROR, Gtk.ButtonsType.OK),
+            }
+            _GTK = Gtk
+    return _GTK or None
+
+
 class NativeDialogs:
     """
     Native dialog system that adapts to the available GUI toolkit.
@@ -35,6 +67,11 @@ class NativeDialogs:
     if GTK is not available.
     """
     
+    __slots__ = ('_gtk_available', '_toolkit', '_parent_window', '_show_impl')
+    
+    # Hidden Tk root shared by Tkinter dialogs shown without a parent window
+    _tk_root = None
+    
     def __init__(self, parent_window=None):
         """Initialize the dialog system with the best available toolkit.
         
@@ -44,6 +81,18 @@ class NativeDialogs:
         self._gtk_available = self._check_gtk()
         self._toolkit = "gtk" if self._gtk_available else "tkinter"
         self._parent_window = parent_window
+        
+        # Pick the dialog implementation once instead of on every call
+        if self._gtk_available:
+            self._show_impl = self._show_gtk_dialog
+        else:
+            self._use_tkinter()
+    
+    def _use_tkinter(self) -> None:
+        """Show all further dialogs with Tkinter, parented to the parent window."""
+        self._gtk_available = False
+        self._toolkit = "tkinter"
+        self._show_impl = partial(self._show_tkinter_dialog, parent=self._parent_window)
     
     def _check_gtk(self) -> bool:
         """
@@ -52,13 +101,17 @@ class NativeDialogs:
         Returns:
             bool: True if GTK is available, False otherwise.
         """
-        try:
-            import gi
-            gi.require_version('Gtk', '3.0')
-            from gi.repository import Gtk
-            return True
-        except (ImportError, ValueError):
+        if _GTK is not None:
+            return _GTK is not False
+        
+        # Without a display GTK cannot open a window, so don't probe for it
+        if not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
             return False
+        
+        # Only look for the bindings here; importing gi and loading the GTK
+        # typelib is left to the first dialog actually shown
+        import importlib.util
+        return importlib.util.find_spec('gi') is not None
     
     def show_info(self, title: str, message: str) -> DialogResult:
         """
@@ -71,10 +124,7 @@ class NativeDialogs:
         Returns:
             DialogResult: Always returns OK for info dialogs.
         """
-        if self._toolkit == "gtk":
-            return self._show_gtk_dialog(DialogType.INFO, title, message)
-        else:
-            return self._show_tkinter_dialog(DialogType.INFO, title, message, self._parent_window)
+        return self._show_impl(DialogType.INFO, title, message)
     
     def show_question(self, title: str, message: str) -> DialogResult:
         """
@@ -87,10 +137,7 @@ class NativeDialogs:
         Returns:
             DialogResult: YES or NO based on user choice.
         """
-        if self._toolkit == "gtk":
-            return self._show_gtk_dialog(DialogType.QUESTION, title, message)
-        else:
-            return self._show_tkinter_dialog(DialogType.QUESTION, title, message, self._parent_window)
+        return self._show_impl(DialogType.QUESTION, title, message)
     
     def show_error(self, title: str, message: str) -> DialogResult:
         """
@@ -103,10 +150,7 @@ class NativeDialogs:
         Returns:
             DialogResult: Always returns OK for error dialogs.
         """
-        if self._toolkit == "gtk":
-            return self._show_gtk_dialog(DialogType.ERROR, title, message)
-        else:
-            return self._show_tkinter_dialog(DialogType.ERROR, title, message, self._parent_window)
+        return self._show_impl(DialogType.ERROR, title, message)
     
     def _show_gtk_dialog(self, dialog_type: DialogType, title: str, message: str) -> DialogResult:
         """
@@ -121,29 +165,20 @@ class NativeDialogs:
             DialogResult: User's response.
         """
         try:
-            import gi
-            gi.require_version('Gtk', '3.0')
-            from gi.repository import Gtk
+            Gtk = _get_gtk()
+            if Gtk is None:
+                # GTK could not be loaded after all; stop trying it
+                self._use_tkinter()
+                return self._show_impl(dialog_type, title, message)
             
-            # Create dialog based on type
-            if dialog_type == DialogType.QUESTION:
-                dialog = Gtk.MessageDialog(
-                    message_type=Gtk.MessageType.QUESTION,
-                    buttons=Gtk.ButtonsType.YES_NO,
-                    text=title
-                )
-            elif dialog_type == DialogType.ERROR:
-                dialog = Gtk.MessageDialog(
-                    message_type=Gtk.MessageType.ERROR,
-                    buttons=Gtk.ButtonsType.OK,
-                    text=title
-                )
-            else:  # INFO
-                dialog = Gtk.MessageDialog(
-                    message_type=Gtk.MessageType.INFO,
-                    buttons=Gtk.ButtonsType.OK,
-                    text=title
-                )
+            # Create dialog based on type, other types shown as INFO
+            message_type, buttons = _GTK_DIALOG_STYLES.get(
+                dialog_type, _GTK_DIALOG_STYLES[DialogType.INFO])
+            dialog = Gtk.MessageDialog(
+                message_type=message_type,
+                buttons=buttons,
+                text=title
+            )
             
             dialog.format_secondary_text(message)
             dialog.set_title("AppImage Installer")
@@ -162,7 +197,7 @@ class NativeDialogs:
                 
         except Exception:
             # Fallback to tkinter if GTK fails
-            return self._show_tkinter_dialog(dialog_type, title, message)
+            return self._show_tkinter_dialog(dialog_type, title, message, self._parent_window)
     
     def _show_tkinter_dialog(self, dialog_type: DialogType, title: str, message: str, parent=None) -> DialogResult:
         """
@@ -185,33 +220,32 @@ class NativeDialogs:
             if parent is not None and dialog_type == DialogType.INFO:
                 return self._show_custom_info_dialog(title, message, parent)
             
-            # Use existing parent window if available, otherwise create temporary root
+            # Use existing parent window if available, otherwise the shared hidden root
             if parent is not None:
                 # Ensure parent window is updated and responsive
                 parent.update_idletasks()
                 root = parent
-                should_destroy = False
             else:
-                # Create temporary root window for standalone dialogs
-                root = tk.Tk()
-                root.withdraw()
-                should_destroy = True
+                # Use the process's existing Tk root, such as the manager
+                # window, rather than starting a second Tk interpreter
+                root = getattr(tk, '_default_root', None)
+                if root is None:
+                    # Tk start-up is slow, so standalone dialogs reuse one hidden root
+                    if NativeDialogs._tk_root is None:
+                        import atexit
+                        NativeDialogs._tk_root = tk.Tk()
+                        NativeDialogs._tk_root.withdraw()
+                        atexit.register(NativeDialogs._destroy_tk_root)
+                    root = NativeDialogs._tk_root
             
             if dialog_type == DialogType.QUESTION:
                 result = messagebox.askyesno(title, message, parent=root)
-                if should_destroy:
-                    root.destroy()
                 return DialogResult.YES if result else DialogResult.NO
-            elif dialog_type == DialogType.ERROR:
-                messagebox.showerror(title, message, parent=root)
-                if should_destroy:
-                    root.destroy()
-                return DialogResult.OK
-            else:  # INFO
-                messagebox.showinfo(title, message, parent=root)
-                if should_destroy:
-                    root.destroy()
-                return DialogResult.OK
+            
+            # ERROR gets the error box, everything else the INFO box
+            show = messagebox.showerror if dialog_type == DialogType.ERROR else messagebox.showinfo
+            show(title, message, parent=root)
+            return DialogResult.OK
                 
         except Exception as e:
             # Last resort: print to console
@@ -220,6 +254,16 @@ class NativeDialogs:
             print(f"Error: {e}")
             return DialogResult.OK
     
+    @staticmethod
+    def _destroy_tk_root() -> None:
+        """Destroy the shared hidden Tk root, if one was created."""
+        root, NativeDialogs._tk_root = NativeDialogs._tk_root, None
+        if root is not None:
+            try:
+                root.destroy()
+            except Exception:
+                pass
+    
     def _show_custom_info_dialog(self, title: str, message: str, parent) -> DialogResult:
         """
         Show a custom info dialog that doesn't have messagebox issues.
@@ -243,9 +287,9 @@ class NativeDialogs:
             dialog.grab_set()  # Make modal
             dialog.transient(parent)  # Keep on top of parent
             
-            # Center the dialog on parent
+            # Center the dialog on parent; the parent is already mapped and
+            # laid out by its mainloop, so no idle-task flush is needed first
             dialog.geometry("400x150")
-            parent.update_idletasks()
             x = parent.winfo_x() + (parent.winfo_width() // 2) - 200
             y = parent.winfo_y() + (parent.winfo_height() // 2) - 75
             dialog.geometry(f"+{x}+{y}")
@@ -302,5 +346,30 @@ class NativeDialogs:
             return DialogResult.OK
 
 
-# Global instance for easy access
-dialogs = NativeDialogs() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_dialogs() -> NativeDialogs:
+    """
+    Get the shared dialog instance, creating it on first use.
+    
+    Returns:
+        NativeDialogs: Dialog system without a parent window.
+    """
+    return NativeDialogs()
+
+
+def __getattr__(name: str):
+    """
+    Resolve the lazily created module attribute ``dialogs``.
+    
+    Keeps ``from .gui_dialogs import dialogs`` working without building the
+    shared instance when the module is imported.
+    
+    Args:
+        name (str): Attribute name.
+        
+    Returns:
+        NativeDialogs: The shared dialog instance for ``dialogs``.
+    """
+    if name == 'dialogs':
+        return get_dialogs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,13 +6,16 @@ allowing users to view, launch, and uninstall AppImage applications.
 """
 
 import sys
-from pathlib import Path
+import threading
+from concurrent.futures import Future
+from dataclasses import fields
 from typing import List, Optional
 from datetime import datetime
+from functools import lru_cache
 
 from .appimage_manager import AppImageManager, AppImageInfo
 from .desktop_integration import DesktopIntegration
-from .gui_dialogs import dialogs, DialogResult
+from .gui_dialogs import get_dialogs, DialogResult
 
 # Try to import GUI frameworks
 try:
@@ -24,6 +27,38 @@ except ImportError:
 
 # GTK support removed for simplicity - using Tkinter only
 
+# AppImageInfo fields in constructor order, for building entries positionally
+_APP_FIELDS = tuple(field.name for field in fields(AppImageInfo))
+_APP_FIELD_SET = frozenset(_APP_FIELDS)
+
+# How often the window checks whether an icon search has finished
+_ICON_POLL_MS = 100
+
+
+@lru_cache(maxsize=512)
+def _format_date(date_str: str) -> str:
+    """
+    Format an ISO install date for display.
+    
+    Install dates never change, so each string is parsed at most once.
+    
+    Args:
+        date_str (str): ISO formatted date.
+        
+    Returns:
+        str: Date as "YYYY-MM-DD HH:MM", or the input if it cannot be parsed.
+    """
+    if not date_str:
+        return "Unknown"
+    
+    try:
+        # fromisoformat only accepts a trailing 'Z' from Python 3.11 on
+        iso_str = date_str[:-1] + '+00:00' if date_str.endswith('Z') else date_str
+        dt = datetime.fromisoformat(iso_str)
+        return dt.strftime("%Y-%m-%d %H:%M")
+    except Exception:
+        return date_str
+
 
 class AppImageManagerGUI:
     """
@@ -41,6 +76,17 @@ class AppImageManagerGUI:
         self.selected_app = None
         self.dialogs = None  # Will be initialized after creating GUI
         
+        # Apps built from the registry and their Treeview rows, with the
+        # registry stamp they came from
+        self._apps_cache = None
+        self._display_rows = []
+        
+        # App shown in each Treeview row, keyed by the row's item id
+        self._iid_to_app = {}
+        
+        # Result of the running icon search, if any
+        self._icon_future = None
+        
         # Try Tkinter first for better compatibility
         if HAS_TKINTER:
             self._create_tkinter_gui()
@@ -76,8 +122,8 @@ class AppImageManagerGUI:
         tree_frame = ttk.Frame(main_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
-        # Columns: Name, Version, Install Date, Path, Index
-        self.tk_tree = ttk.Treeview(tree_frame, columns=('version', 'date', 'path', 'index'), show='tree headings')
+        # Columns: Name, Version, Install Date, Path
+        self.tk_tree = ttk.Treeview(tree_frame, columns=('version', 'date', 'path'), show='tree headings')
         self.tk_tree.heading('#0', text='Application')
         self.tk_tree.heading('version', text='Version')
         self.tk_tree.heading('date', text='Installed')
@@ -87,7 +133,6 @@ class AppImageManagerGUI:
         self.tk_tree.column('version', width=100, minwidth=80)
         self.tk_tree.column('date', width=120, minwidth=100)
         self.tk_tree.column('path', width=300, minwidth=200)
-        self.tk_tree.column('index', width=0, minwidth=0, stretch=False)  # Hidden column
         
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tk_tree.yview)
@@ -133,90 +178,85 @@ class AppImageManagerGUI:
     
     def _refresh_tk_list(self) -> None:
         """Refresh the Tkinter app list."""
-        # Clear existing items
-        for item in self.tk_tree.get_children():
-            self.tk_tree.delete(item)
+        # Clear existing items in a single Tcl call
+        self.tk_tree.delete(*self.tk_tree.get_children())
         
         # Load installed apps
         self.apps = self._load_installed_apps()
         
-        # Add to tree  
-        for i, app in enumerate(self.apps):
-            install_date = self._format_date(app.installed_date)
-            item_id = self.tk_tree.insert('', 'end', text=app.name, values=(
-                app.version,
-                install_date,
-                app.appimage_path,
-                str(i)  # Store app index as a value
-            ))
+        # Add to tree, remembering which app each row shows. The rows are
+        # inserted with the Tcl command directly, skipping the option
+        # formatting ttk.Treeview.insert repeats for every row
+        iid_to_app = self._iid_to_app = {}
+        call = self.tk_tree.tk.call
+        tree = str(self.tk_tree)
+        for app, (name, *values) in zip(self.apps, self._display_rows):
+            iid_to_app[call(tree, 'insert', '', 'end', '-text', name, '-values', values)] = app
     
     def _load_installed_apps(self) -> List[AppImageInfo]:
-        """Load list of installed AppImages."""
-        registry = self.manager._load_registry()
+        """
+        Load list of installed AppImages, rebuilt only when the registry changed.
+        
+        Also sets self._display_rows to the matching (name, version, install
+        date, path) Treeview rows, in the same order as the returned apps.
+        """
+        registry = self.manager._get_cached_registry()
+        stamp = self.manager._registry_stamp
+        if self._apps_cache is not None and self._apps_cache[0] == stamp:
+            self._display_rows = self._apps_cache[2]
+            return list(self._apps_cache[1])
+        
         apps = []
         
-        for path, data in registry.items():
-            try:
-                app = AppImageInfo(**data)
-                apps.append(app)
-            except Exception:
-                # Skip invalid entries
+        for data in registry.values():
+            # Skip invalid entries
+            if not isinstance(data, dict) or not data.keys() >= _APP_FIELD_SET:
                 continue
+            apps.append(AppImageInfo(*[data[name] for name in _APP_FIELDS]))
         
         # Sort by name
         apps.sort(key=lambda x: x.name.lower())
-        return apps
+        
+        # Format the rows once per registry change rather than on every refresh
+        self._display_rows = [
+            (app.name, app.version, self._format_date(app.installed_date), app.appimage_path)
+            for app in apps
+        ]
+        self._apps_cache = (stamp, apps, self._display_rows)
+        return list(apps)
     
     def _format_date(self, date_str: str) -> str:
         """Format date string for display."""
-        if not date_str:
-            return "Unknown"
-        
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime("%Y-%m-%d %H:%M")
-        except Exception:
-            return date_str
+        return _format_date(date_str)
     
     def _process_gtk_events_and_refresh(self) -> None:
         """Process pending GTK events and then refresh the GUI to avoid conflicts."""
-        # Process any pending GTK events before refreshing Tkinter GUI
+        # Process any pending GTK events before refreshing Tkinter GUI, so a
+        # closed GTK dialog is really gone. GTK is only loaded once a GTK
+        # dialog has been shown; don't import it just to find nothing pending
         try:
-            import gi
-            gi.require_version('Gtk', '3.0')
-            from gi.repository import Gtk
-            while Gtk.events_pending():
+            from .gui_dialogs import _GTK as Gtk
+            while Gtk and Gtk.events_pending():
                 Gtk.main_iteration()
         except:
             pass
-        # Now refresh the GUI
-        self.tk_root.after(50, self._refresh_tk_list)
+        # Now refresh the GUI once Tk has handled its own pending events
+        self.tk_root.after_idle(self._refresh_tk_list)
     
     # Tkinter event handlers
     def _on_tk_selection_changed(self, event) -> None:
         """Handle Tkinter selection change."""
         selection = self.tk_tree.selection()
-        if selection:
-            item = selection[0]
-            try:
-                # Get values tuple and extract the index (last element)
-                values = self.tk_tree.item(item, 'values')
-                app_index = int(values[3])  # index is the 4th value (0-based)
-                self.selected_app = self.apps[app_index]
-                self.tk_launch_btn.config(state=tk.NORMAL)
-                self.tk_uninstall_btn.config(state=tk.NORMAL)
-                # Enable icon button if app has no custom icon or uses default
-                has_default_icon = (not self.selected_app.icon_path or 
-                                  self.selected_app.icon_path == 'application-x-executable' or
-                                  'application' in self.selected_app.icon_path)
-                self.tk_icon_btn.config(state=tk.NORMAL if has_default_icon else tk.DISABLED)
-            except (ValueError, IndexError):
-                self.selected_app = None
-                self.tk_launch_btn.config(state=tk.DISABLED)
-                self.tk_uninstall_btn.config(state=tk.DISABLED)
-                self.tk_icon_btn.config(state=tk.DISABLED)
+        self.selected_app = self._iid_to_app.get(selection[0]) if selection else None
+        if self.selected_app is not None:
+            self.tk_launch_btn.config(state=tk.NORMAL)
+            self.tk_uninstall_btn.config(state=tk.NORMAL)
+            # Enable icon button if app has no custom icon or uses a default
+            # 'application-*' one such as application-x-executable
+            icon_path = self.selected_app.icon_path
+            has_default_icon = not icon_path or 'application' in icon_path
+            self.tk_icon_btn.config(state=tk.NORMAL if has_default_icon else tk.DISABLED)
         else:
-            self.selected_app = None
             self.tk_launch_btn.config(state=tk.DISABLED)
             self.tk_uninstall_btn.config(state=tk.DISABLED)
             self.tk_icon_btn.config(state=tk.DISABLED)
@@ -286,8 +326,7 @@ class AppImageManagerGUI:
                 # Uninstall AppImage
                 if self.manager.uninstall_appimage(app.appimage_path):
                     # Use global GTK dialogs (no parent window) and properly handle event loops
-                    from .gui_dialogs import dialogs
-                    dialogs.show_info(
+                    get_dialogs().show_info(
                         "Uninstall Successful",
                         f"'{app.name}' has been successfully uninstalled.\n\n"
                         f"All shortcuts and menu entries have been removed."
@@ -310,6 +349,11 @@ class AppImageManagerGUI:
     
     def _find_icon_for_app(self, app: AppImageInfo) -> None:
         """Find and apply a better icon for the selected application."""
+        # Selecting another app re-enables the button, so still make sure
+        # only one search runs at a time
+        if self._icon_future is not None:
+            return
+        
         # Ask user for consent to search web
         response = self.dialogs.show_question(
             "Search for Icon",
@@ -320,96 +364,125 @@ class AppImageManagerGUI:
             f"• Only search for common, well-known applications\n\n"
             f"Click 'Yes' to search online or 'No' to use local system icons only."
         )
+        search_web = response == DialogResult.YES
         
-        if response == DialogResult.YES:
-            # Show progress message
-            self.tk_root.config(cursor="wait")
-            self.tk_root.update()
+        # Search in a worker thread so the window keeps handling events
+        if search_web:
+            self._icon_future = self._run_in_background(
+                self.manager.search_web_icon, app.name, app.version)
+        else:
+            self._icon_future = self._run_in_background(
+                self.manager._find_system_icon, app.name)
+        
+        self.tk_root.config(cursor="wait")
+        self.tk_icon_btn.config(state=tk.DISABLED)
+        self.tk_root.after(_ICON_POLL_MS, self._poll_icon_search, app, search_web)
+    
+    @staticmethod
+    def _run_in_background(func, *args) -> Future:
+        """
+        Run a function in a daemon thread.
+        
+        A daemon thread, unlike a thread pool worker, does not keep the
+        process alive after the window is closed mid-search.
+        
+        Args:
+            func: Function to call.
+            *args: Arguments for the function.
             
+        Returns:
+            Future: Future completed with the function's result or exception.
+        """
+        future = Future()
+        
+        def run():
             try:
-                # Search for web icon
-                icon_path = self.manager.search_web_icon(app.name, app.version)
-                
-                if icon_path:
-                    # Update the app's icon path
-                    app.icon_path = icon_path
-                    
-                    # Update in registry
-                    registry = self.manager._load_registry()
-                    abs_path = str(Path(app.appimage_path).absolute())
-                    if abs_path in registry:
-                        registry[abs_path]['icon_path'] = icon_path
-                        self.manager._save_registry(registry)
-                    
-                    # Recreate desktop file with new icon
-                    if app.desktop_file_path:
-                        self.desktop.remove_desktop_file(app.desktop_file_path)
-                    
-                    app.desktop_file_path = self.desktop.create_desktop_file(app)
-                    self.desktop.create_desktop_shortcut(app)
-                    
-                    # Use global GTK dialogs (no parent window) and properly handle event loops
-                    from .gui_dialogs import dialogs
-                    dialogs.show_info(
-                        "Icon Updated",
-                        f"Successfully found and applied a new icon for '{app.name}'!"
-                    )
-                    # Process GTK events and refresh GUI
-                    self._process_gtk_events_and_refresh()
-                else:
-                    # Use global GTK dialogs (no parent window)
-                    from .gui_dialogs import dialogs
-                    dialogs.show_info(
-                        "No Icon Found",
-                        f"Could not find a suitable icon for '{app.name}' online.\n"
-                        f"The application will continue to use the default icon."
-                    )
-                    
+                future.set_result(func(*args))
             except Exception as e:
-                self.dialogs.show_error(
-                    "Icon Search Error",
-                    f"Error searching for icon: {str(e)}"
-                )
-            finally:
-                self.tk_root.config(cursor="")
+                future.set_exception(e)
         
-        else:
-            # Try to find better system icon
-            system_icon = self.manager._find_system_icon(app.name)
-            if system_icon and system_icon != app.icon_path:
-                # Update the app's icon path
-                app.icon_path = system_icon
-                
-                # Update in registry
-                registry = self.manager._load_registry()
-                abs_path = str(Path(app.appimage_path).absolute())
-                if abs_path in registry:
-                    registry[abs_path]['icon_path'] = system_icon
-                    self.manager._save_registry(registry)
-                
-                # Recreate desktop file with new icon
-                if app.desktop_file_path:
-                    self.desktop.remove_desktop_file(app.desktop_file_path)
-                
-                app.desktop_file_path = self.desktop.create_desktop_file(app)
-                self.desktop.create_desktop_shortcut(app)
+        threading.Thread(target=run, daemon=True).start()
+        return future
+    
+    def _apply_icon(self, app: AppImageInfo, icon_path: str) -> None:
+        """
+        Switch an installed application to a new icon.
+        
+        Updates the registry entry, the menu entry and the desktop shortcut.
+        
+        Args:
+            app (AppImageInfo): Application to update.
+            icon_path (str): New icon path.
+        """
+        app.icon_path = icon_path
+        
+        # Update in registry
+        self.manager.update_icon_path(app.appimage_path, icon_path)
+        
+        # Recreate desktop file with new icon
+        with self.desktop.batched():
+            if app.desktop_file_path:
+                self.desktop.remove_desktop_file(app.desktop_file_path)
+            
+            app.desktop_file_path = self.desktop.create_desktop_file(app)
+        self.desktop.create_desktop_shortcut(app)
+    
+    def _poll_icon_search(self, app: AppImageInfo, search_web: bool) -> None:
+        """
+        Apply the result of the running icon search once it has finished.
+        
+        Args:
+            app (AppImageInfo): Application the icon was searched for.
+            search_web (bool): True for a web search, False for system icons.
+        """
+        future = self._icon_future
+        if not future.done():
+            self.tk_root.after(_ICON_POLL_MS, self._poll_icon_search, app, search_web)
+            return
+        
+        self._icon_future = None
+        self.tk_root.config(cursor="")
+        # Restore the buttons for whichever app is selected now
+        self._on_tk_selection_changed(None)
+        
+        try:
+            icon_path = future.result()
+            
+            # The app may have been uninstalled while the search ran
+            if not self.manager.is_registered(app.appimage_path):
+                return
+            
+            if icon_path and (search_web or icon_path != app.icon_path):
+                self._apply_icon(app, icon_path)
                 
                 # Use global GTK dialogs (no parent window) and properly handle event loops
-                from .gui_dialogs import dialogs
-                dialogs.show_info(
-                    "Icon Updated",
-                    f"Successfully updated the icon for '{app.name}' using a system icon!"
-                )
+                if search_web:
+                    message = f"Successfully found and applied a new icon for '{app.name}'!"
+                else:
+                    message = f"Successfully updated the icon for '{app.name}' using a system icon!"
+                get_dialogs().show_info("Icon Updated", message)
                 # Process GTK events and refresh GUI
                 self._process_gtk_events_and_refresh()
+            elif search_web:
+                # Use global GTK dialogs (no parent window)
+                get_dialogs().show_info(
+                    "No Icon Found",
+                    f"Could not find a suitable icon for '{app.name}' online.\n"
+                    f"The application will continue to use the default icon."
+                )
             else:
                 # Use global GTK dialogs (no parent window)
-                from .gui_dialogs import dialogs
-                dialogs.show_info(
+                get_dialogs().show_info(
                     "No Better Icon",
                     f"Could not find a better system icon for '{app.name}'.\n"
                     f"The application will continue to use the current icon."
                 )
+                
+        except Exception as e:
+            self.dialogs.show_error(
+                "Icon Search Error",
+                f"Error searching for icon: {str(e)}"
+            )
 
 
 def main():
@@ -9,9 +9,6 @@ import sys
 import argparse
 from pathlib import Path
 
-from .appimage_handler import AppImageHandler
-from .file_association import FileAssociation
-
 
 def main():
     """
@@ -105,6 +102,7 @@ def handle_appimage_file(appimage_file: str) -> int:
         return 1
     
     # Handle the AppImage
+    from .appimage_handler import AppImageHandler
     handler = AppImageHandler()
     success = handler.handle_appimage(str(appimage_path.absolute()))
     
@@ -119,6 +117,7 @@ def handle_register() -> int:
         int: Exit code (0 for success, 1 for error).
     """
     try:
+        from .file_association import FileAssociation
         association = FileAssociation()
         
         if association.register():
@@ -142,6 +141,7 @@ def handle_unregister() -> int:
         int: Exit code (0 for success, 1 for error).
     """
     try:
+        from .file_association import FileAssociation
         association = FileAssociation()
         
         if association.unregister():
@@ -6,10 +6,9 @@ registry management, and version update handling.
 """
 
 import pytest
-import tempfile
 import json
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
 
 from src.appimage_manager import AppImageManager, AppImageInfo
 
@@ -17,21 +16,22 @@ from src.appimage_manager import AppImageManager, AppImageInfo
 class TestAppImageManager:
     """Test cases for AppImageManager class."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_manager(self, tmp_path):
         """Set up test environment before each test."""
-        # Create temporary directory for test files
-        self.temp_dir = Path(tempfile.mkdtemp())
+        # Per-test temporary directory, created and cleaned up by pytest
+        self.temp_dir = tmp_path
         
-        # Mock the manager to use temporary directories
+        # Point every manager path into the temporary directory; the
+        # directories themselves are only created by tests that write
         self.manager = AppImageManager()
         self.manager.config_dir = self.temp_dir / "config"
         self.manager.data_dir = self.temp_dir / "data"
+        self.manager.applications_dir = self.manager.data_dir / "applications"
+        self.manager.icons_dir = self.manager.data_dir / "icons" / "hicolor"
         self.manager.appimage_storage = self.temp_dir / "Applications"
         self.manager.registry_file = self.temp_dir / "config" / "appimage-installer" / "registry.json"
         
-        # Create directories
-        self.manager._ensure_directories()
-        
         # Sample AppImage info for testing
         self.sample_info = AppImageInfo(
             name="Test App",
@@ -46,19 +46,14 @@ class TestAppImageManager:
             installed_date="2023-01-01T12:00:00"
         )
     
-    def teardown_method(self):
-        """Clean up after each test."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_appimage_detection(self):
         """Test AppImage file detection."""
         # Create test files
         appimage_file = self.temp_dir / "test.AppImage"
         regular_file = self.temp_dir / "test.txt"
         
-        # Create AppImage file with signature
-        appimage_file.write_bytes(b"#!/bin/sh\nAppImage signature here\x00" + b"A" * 1000)
+        # Create AppImage file; a non-empty file with the extension is enough
+        appimage_file.write_bytes(b"#!/bin/sh\nAppImage signature here\x00")
         regular_file.write_text("Not an AppImage")
         
         # Make AppImage executable
@@ -68,7 +63,35 @@ class TestAppImageManager:
         assert self.manager.is_appimage(str(appimage_file))
         assert not self.manager.is_appimage(str(regular_file))
         assert not self.manager.is_appimage("/nonexistent/file.AppImage")
-    
+
+    def test_appimage_detection_by_magic(self):
+        """Test AppImage detection of files without the .AppImage extension."""
+        type2_file = self.temp_dir / "type2-app"
+        plain_elf_file = self.temp_dir / "plain-elf"
+
+        # AppImage type 2 marker lives at offset 8 of the ELF header
+        type2_file.write_bytes(b"\x7fELF\x02\x01\x01\x00AI\x02\x00" + b"\x00" * 64)
+        plain_elf_file.write_bytes(b"\x7fELF\x02\x01\x01\x00\x00\x00\x00\x00" + b"\x00" * 64)
+
+        assert self.manager.is_appimage(str(type2_file))
+        assert not self.manager.is_appimage(str(plain_elf_file))
+
+    def test_metadata_extraction_cache(self):
+        """Test that metadata is only extracted again when the file changes."""
+        appimage_file = self.temp_dir / "cached.AppImage"
+        appimage_file.write_bytes(b"\x7fELF\x02\x01\x01\x00AI\x02\x00" + b"\x00" * 64)
+
+        metadata = {'name': 'Cached App', 'version': '1.0'}
+        with patch.object(self.manager, '_extract_appimage_metadata', return_value=metadata) as mock_extract, \
+             patch.object(self.manager, '_get_icon_for_appimage', return_value='app-icon'):
+            assert self.manager.extract_appimage_info(str(appimage_file)).name == "Cached App"
+            assert self.manager.extract_appimage_info(str(appimage_file)).version == "1.0"
+            assert mock_extract.call_count == 1
+
+            appimage_file.write_bytes(b"\x7fELF\x02\x01\x01\x00AI\x02\x00" + b"\x00" * 128)
+            self.manager.extract_appimage_info(str(appimage_file))
+            assert mock_extract.call_count == 2
+
     def test_registry_operations(self):
         """Test registry save and load operations."""
         # Test save and load registry
@@ -95,6 +118,23 @@ class TestAppImageManager:
         empty_registry = self.manager._load_registry()
         assert empty_registry == {}
     
+    def test_registry_cache_invalidation(self):
+        """Test that the cached registry is refreshed when the file changes."""
+        assert self.manager._save_registry({"/path/to/app1.AppImage": {"name": "App 1"}})
+        assert "/path/to/app1.AppImage" in self.manager._load_registry()
+
+        # Simulate another process rewriting the registry
+        self.manager.registry_file.write_text(json.dumps({
+            "/path/to/app2.AppImage": {"name": "App 2", "version": "2.0.0"}
+        }))
+
+        loaded_registry = self.manager._load_registry()
+        assert list(loaded_registry) == ["/path/to/app2.AppImage"]
+
+        # Mutating the returned dict must not leak into the cache
+        loaded_registry.clear()
+        assert "/path/to/app2.AppImage" in self.manager._load_registry()
+
     def test_appimage_registration(self):
         """Test AppImage registration and unregistration."""
         # Register AppImage
@@ -116,6 +156,43 @@ class TestAppImageManager:
         assert not self.manager.is_registered(self.sample_info.appimage_path)
         assert self.manager.get_registered_info(self.sample_info.appimage_path) is None
 
+    def test_update_icon_path(self):
+        """Test that an icon update replaces the entry instead of modifying the cached one."""
+        assert self.manager.register_appimage(self.sample_info)
+        cached_entry = self.manager._get_cached_registry()[self.sample_info.appimage_path]
+        
+        assert self.manager.update_icon_path(self.sample_info.appimage_path, "new-icon.png")
+        assert self.manager.get_registered_info(self.sample_info.appimage_path).icon_path == "new-icon.png"
+        assert cached_entry["icon_path"] == "test-icon.png"
+        
+        # A failed save leaves the cache as it was on disk
+        with patch.object(self.manager, '_save_registry', return_value=False):
+            assert not self.manager.update_icon_path(self.sample_info.appimage_path, "other-icon.png")
+        assert self.manager.get_registered_info(self.sample_info.appimage_path).icon_path == "new-icon.png"
+        
+        # Unregistered AppImages are left alone
+        assert self.manager.update_icon_path("/path/to/missing.AppImage", "icon.png")
+        assert not self.manager.is_registered("/path/to/missing.AppImage")
+
+    def test_registry_key_normalization(self, monkeypatch):
+        """Test that absolute and relative paths to one file share a registry key."""
+        monkeypatch.chdir(self.temp_dir)
+        absolute_key = self.manager._get_registry_key(str(self.temp_dir / "." / "apps" / "test.AppImage"))
+        relative_key = self.manager._get_registry_key("apps/test.AppImage")
+        
+        assert absolute_key == relative_key == str(self.temp_dir / "apps" / "test.AppImage")
+
+    def test_appimage_info_dict_roundtrip(self):
+        """Test AppImageInfo conversion to and from registry entries."""
+        data = self.sample_info.to_dict()
+        assert AppImageInfo.from_dict(data) == self.sample_info
+
+        # Entries written by older versions may lack fields
+        partial_info = AppImageInfo.from_dict({"name": "Old App", "version": "0.9"})
+        assert partial_info.name == "Old App"
+        assert partial_info.categories == []
+        assert partial_info.installed_date == ""
+
     def test_version_comparison(self):
         """Test version comparison functionality."""
         # Test semantic version comparison
@@ -272,6 +349,9 @@ class TestAppImageManager:
     @patch('src.appimage_manager.os.chmod')
     def test_copy_to_storage(self, mock_chmod, mock_copy):
         """Test copying AppImage to storage directory."""
+        # Storage directory is normally created by install_appimage
+        self.manager._ensure_directories()
+        
         # Create a source file
         source_file = self.temp_dir / "test.AppImage"
         source_file.write_text("test content")
@@ -294,6 +374,70 @@ class TestAppImageManager:
         assert target_path is not None
         assert target_path.name == "Test_App_1.AppImage"
 
+    def _install_replaceable_app(self):
+        """Register an installed app and return it with an update for it."""
+        self.manager._ensure_directories()
+        
+        old_exec = self.manager.appimage_storage / "Old_App.AppImage"
+        old_exec.write_text("old version")
+        installed_info = AppImageInfo(
+            name="Old App",
+            version="1.0.0",
+            description="Test application",
+            icon_path="",
+            desktop_file_path="",
+            appimage_path="/path/to/Old-App-1.0.0.AppImage",
+            exec_command=str(old_exec),
+            categories=[],
+            mime_types=[],
+            installed_date="2023-01-01T12:00:00"
+        )
+        assert self.manager.register_appimage(installed_info)
+        
+        new_source = self.temp_dir / "New-App-2.0.0.AppImage"
+        new_source.write_text("new version")
+        new_info = AppImageInfo(
+            name="New App",
+            version="2.0.0",
+            description="Test application",
+            icon_path="",
+            desktop_file_path="",
+            appimage_path=str(new_source),
+            exec_command=str(new_source),
+            categories=[],
+            mime_types=[],
+            installed_date=""
+        )
+        return installed_info, new_info, old_exec
+
+    def test_replace_appimage_with_new_filename(self):
+        """Test replacing an installed AppImage whose stored file name changes."""
+        installed_info, new_info, old_exec = self._install_replaceable_app()
+        
+        assert self.manager.replace_appimage(installed_info, new_info)
+        
+        # New copy is stored and registered, old executable and entry are gone
+        new_exec = self.manager.appimage_storage / "New_App.AppImage"
+        assert new_info.exec_command == str(new_exec)
+        assert new_exec.read_text() == "new version"
+        assert not old_exec.exists()
+        assert not self.manager.is_registered(installed_info.appimage_path)
+        assert self.manager.get_registered_info(new_info.appimage_path).exec_command == str(new_exec)
+
+    def test_replace_appimage_copy_failure(self):
+        """Test that a failed copy leaves the installed AppImage untouched."""
+        installed_info, new_info, old_exec = self._install_replaceable_app()
+        
+        with patch.object(self.manager, '_copy_to_storage', return_value=None):
+            assert not self.manager.replace_appimage(installed_info, new_info)
+        
+        # Old executable and registry entry still describe a working install
+        assert old_exec.read_text() == "old version"
+        registered = self.manager.get_registered_info(installed_info.appimage_path)
+        assert registered is not None
+        assert registered.exec_command == str(old_exec)
+        assert not self.manager.is_registered(new_info.appimage_path)
+
     def test_filename_sanitization(self):
         """Test filename sanitization for safe storage."""
         # Test basic sanitization
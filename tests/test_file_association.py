@@ -0,0 +1,155 @@
+"""
+Unit tests for File Association module.
+
+Tests the default-application handling in the user's mimeapps.list and
+the check that lets re-registration skip the database updates.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from src.desktop_integration import DesktopIntegration
+from src.file_association import FileAssociation, _DEFAULT_MIME_TYPES, _HANDLER_DESKTOP_FILE
+
+
+class TestFileAssociation:
+    """Test cases for FileAssociation class."""
+
+    @pytest.fixture(autouse=True)
+    def setup_association(self, tmp_path, monkeypatch):
+        """Set up test environment before each test."""
+        # Keep every XDG location inside the temporary directory
+        self.temp_dir = tmp_path
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+
+        self.association = FileAssociation()
+        self.mimeapps_file = tmp_path / "config" / "mimeapps.list"
+
+    def test_default_applications_keep_existing_entries(self):
+        """Test that rewriting mimeapps.list keeps the user's other entries."""
+        self.mimeapps_file.parent.mkdir(parents=True)
+        self.mimeapps_file.write_text(
+            "# Set by the user\n"
+            "[Default Applications]\n"
+            "text/html=firefox.desktop\n"
+            "application/x-executable=other.desktop\n"
+            "\n"
+            "[Added Associations]\n"
+            "text/plain=gedit.desktop;org.gnome.TextEditor.desktop;\n"
+            "image/png=eog.desktop;\n"
+        )
+
+        assert self.association._set_default_applications()
+
+        content = self.mimeapps_file.read_text()
+        assert content == (
+            "# Set by the user\n"
+            "[Default Applications]\n"
+            "text/html=firefox.desktop\n"
+            f"application/x-executable={_HANDLER_DESKTOP_FILE}\n"
+            f"application/x-appimage={_HANDLER_DESKTOP_FILE}\n"
+            f"application/x-sharedlib={_HANDLER_DESKTOP_FILE}\n"
+            f"application/octet-stream={_HANDLER_DESKTOP_FILE}\n"
+            "\n"
+            "[Added Associations]\n"
+            "text/plain=gedit.desktop;org.gnome.TextEditor.desktop;\n"
+            "image/png=eog.desktop;\n"
+        )
+
+    def test_default_applications_added_to_new_file(self):
+        """Test that all defaults are written when mimeapps.list does not exist."""
+        assert self.association._set_default_applications()
+
+        lines = self.mimeapps_file.read_text().splitlines()
+        assert lines[0] == "[Default Applications]"
+        assert lines[1:] == [f"{mime_type}={_HANDLER_DESKTOP_FILE}" for mime_type in _DEFAULT_MIME_TYPES]
+
+    def test_default_applications_unparsable_file(self):
+        """Test that an unparsable mimeapps.list is left to xdg-mime."""
+        self.mimeapps_file.parent.mkdir(parents=True)
+        self.mimeapps_file.write_text("not an ini file\n")
+
+        with patch.object(self.association, '_set_defaults_with_xdg_mime', return_value=True) as mock_xdg_mime:
+            assert self.association._set_default_applications()
+
+        mock_xdg_mime.assert_called_once_with()
+        assert self.mimeapps_file.read_text() == "not an ini file\n"
+
+    def _write_registration(self):
+        """Write the registration files and database caches newer than them."""
+        desktop_integration = DesktopIntegration()
+        assert self.association._create_mime_type()
+        assert desktop_integration.create_appimage_installer_desktop_files(update_database=False)
+
+        self.mime_cache = os.path.join(self.association.mime_dir, "mime.cache")
+        self.desktop_cache = os.path.join(self.association.applications_dir, "mimeinfo.cache")
+        newest = max(os.path.getmtime(path) for path in self.association._registration_files)
+        for cache in (self.mime_cache, self.desktop_cache):
+            open(cache, 'wb').close()
+            os.utime(cache, (newest + 10, newest + 10))
+        return desktop_integration
+
+    def test_registration_current_skips_database_updates(self):
+        """Test that an unchanged, indexed registration only restores the defaults."""
+        desktop_integration = self._write_registration()
+        assert self.association._registration_is_current(desktop_integration)
+
+        with patch.object(self.association, '_update_mime_database') as mock_mime_update, \
+             patch.object(self.association, '_update_desktop_database') as mock_desktop_update, \
+             patch.object(self.association, '_register_system_mime_type') as mock_system_mime, \
+             patch.object(self.association, '_set_default_applications', return_value=True) as mock_defaults:
+            assert self.association.register()
+
+        mock_mime_update.assert_not_called()
+        mock_desktop_update.assert_not_called()
+        mock_system_mime.assert_not_called()
+        mock_defaults.assert_called_once_with()
+
+    def test_registration_not_current_when_xml_changed(self):
+        """Test that a changed MIME definition needs a full registration."""
+        desktop_integration = self._write_registration()
+        with open(self.association._mime_file, 'ab') as f:
+            f.write(b"\n")
+        os.utime(self.association._mime_file, (0, 0))
+
+        assert not self.association._registration_is_current(desktop_integration)
+
+    def test_registration_not_current_when_mime_cache_older(self):
+        """Test that a MIME cache older than the definition needs a full registration."""
+        desktop_integration = self._write_registration()
+        mime_mtime = os.path.getmtime(self.association._mime_file)
+        os.utime(self.mime_cache, (mime_mtime - 10, mime_mtime - 10))
+
+        assert not self.association._registration_is_current(desktop_integration)
+
+    def test_registration_not_current_when_cache_missing(self):
+        """Test that a missing database cache needs a full registration."""
+        desktop_integration = self._write_registration()
+        os.unlink(self.desktop_cache)
+
+        assert not self.association._registration_is_current(desktop_integration)
+
+    def test_register_stops_when_mime_database_update_fails(self):
+        """Test that defaults are only claimed once the MIME type is registered."""
+        with patch.object(self.association, '_update_mime_database', return_value=False), \
+             patch.object(self.association, '_update_desktop_database', return_value=True), \
+             patch.object(self.association, '_register_system_mime_type') as mock_system_mime, \
+             patch.object(self.association, '_set_default_applications') as mock_defaults:
+            assert not self.association.register()
+
+        mock_defaults.assert_not_called()
+        mock_system_mime.assert_not_called()
+
+    def test_register_sets_defaults_after_database_updates(self):
+        """Test a full registration once both database updates succeed."""
+        with patch.object(self.association, '_update_mime_database', return_value=True), \
+             patch.object(self.association, '_update_desktop_database', return_value=True), \
+             patch.object(self.association, '_register_system_mime_type') as mock_system_mime, \
+             patch.object(self.association, '_set_default_applications', return_value=True) as mock_defaults:
+            assert self.association.register()
+
+        mock_defaults.assert_called_once_with()
+        mock_system_mime.assert_called_once_with()